@@ -10,7 +10,7 @@ Features:
 import asyncio
 import os
 import tempfile
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
@@ -26,6 +26,7 @@ from playwright.async_api import (
 from .config import settings
 from .devices import DeviceProfile, get_device
 from .logging import log_extra
+from .models import ACTIONS_ADAPTER, Action
 
 
 class BrowserRecorder:
@@ -44,6 +45,9 @@ class BrowserRecorder:
         self._pool_size = pool_size
         self._context_pool: list[BrowserContext] = []
         self._pool_lock = asyncio.Lock()
+        # Strong references to in-flight pool refills so they aren't GC'd
+        self._refills: set[asyncio.Task[None]] = set()
+        self._start_lock = asyncio.Lock()
 
     async def start(self) -> None:
         """Start the Playwright browser."""
@@ -55,6 +59,11 @@ class BrowserRecorder:
 
     async def stop(self) -> None:
         """Stop the browser and cleanup."""
+        # Finish pending refills first so none adds a context after the pool is cleared
+        for task in self._refills:
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+
         # Close all pooled contexts
         async with self._pool_lock:
             for ctx in self._context_pool:
@@ -69,6 +78,46 @@ class BrowserRecorder:
             self._playwright = None
         log_extra("Browser stopped")
 
+    async def _ensure_started(self) -> Browser:
+        """Launch the browser on first use; concurrent callers share one launch."""
+        if self._browser is None:
+            async with self._start_lock:
+                if self._browser is None:
+                    await self.start()
+        if self._browser is None:
+            raise RuntimeError("Browser not initialized")
+        return self._browser
+
+    async def __aenter__(self) -> "BrowserRecorder":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
+
+    async def prewarm(self, count: int = 2) -> int:
+        """Open idle pooled contexts ahead of time so early screenshots skip setup.
+
+        Args:
+            count: Number of contexts to have ready (capped at the pool size)
+
+        Returns:
+            Number of contexts created
+        """
+        browser = await self._ensure_started()
+
+        missing = min(count, self._pool_size) - len(self._context_pool)
+        if missing <= 0:
+            return 0
+
+        contexts = await asyncio.gather(
+            *(browser.new_context(viewport=settings.video_size) for _ in range(missing))
+        )
+        async with self._pool_lock:
+            self._context_pool.extend(contexts)
+        log_extra("Prewarmed browser contexts", created=missing, pool_size=len(self._context_pool))
+        return missing
+
     @asynccontextmanager
     async def recording_context(
         self,
@@ -81,8 +130,7 @@ class BrowserRecorder:
             video_dir: Directory to save video (default: temp)
             device: Device profile name or DeviceProfile for emulation
         """
-        if not self._browser:
-            await self.start()
+        browser = await self._ensure_started()
 
         # Use temp directory if not specified
         if video_dir is None:
@@ -90,9 +138,6 @@ class BrowserRecorder:
 
         video_dir.mkdir(parents=True, exist_ok=True)
 
-        if self._browser is None:
-            raise RuntimeError("Browser not initialized")
-
         # Resolve device profile
         profile = self._resolve_device(device)
         viewport = profile.viewport if profile else settings.video_size
@@ -113,7 +158,7 @@ class BrowserRecorder:
             context_options["has_touch"] = profile.has_touch
             log_extra("Device emulation", device=profile.name, viewport=viewport)
 
-        context = await self._browser.new_context(**context_options)
+        context = await browser.new_context(**context_options)
         page = await context.new_page()
 
         try:
@@ -142,7 +187,8 @@ class BrowserRecorder:
         """Get a browser context from the pool (without video recording).
 
         This is more efficient for screenshots and navigation tasks where
-        video recording is not needed. Contexts are reused when possible.
+        video recording is not needed. Each context is used for one capture
+        only; the pool keeps fresh ones ready so callers skip the setup.
 
         Args:
             device: Device profile name or DeviceProfile for emulation
@@ -150,11 +196,7 @@ class BrowserRecorder:
         Note: Pooled contexts don't support video recording.
         For video recording, use recording_context() instead.
         """
-        if not self._browser:
-            await self.start()
-
-        if self._browser is None:
-            raise RuntimeError("Browser not initialized")
+        browser = await self._ensure_started()
 
         # Resolve device profile
         profile = self._resolve_device(device)
@@ -169,16 +211,16 @@ class BrowserRecorder:
             context_options["has_touch"] = profile.has_touch
             log_extra("Device emulation (pooled)", device=profile.name, viewport=viewport)
 
-        # Try to get a context from the pool
+        # Pooled contexts are plain (no device emulation), so only those callers reuse one
         context: BrowserContext | None = None
         async with self._pool_lock:
-            if self._context_pool:
+            if profile is None and self._context_pool:
                 context = self._context_pool.pop()
                 log_extra("Reusing pooled context", pool_remaining=len(self._context_pool))
 
         # Create new context if pool was empty
         if context is None:
-            context = await self._browser.new_context(**context_options)
+            context = await browser.new_context(**context_options)
             log_extra("Created new context", pool_size=len(self._context_pool))
 
         page = await context.new_page()
@@ -186,20 +228,43 @@ class BrowserRecorder:
         try:
             yield context, page
         finally:
-            # Close the page but return context to pool if room
-            await page.close()
+            # Never hand a used context to the next capture: cookies, storage,
+            # cache and permissions would all carry over. Swap it for a fresh
+            # one in the background so the caller returns as soon as its
+            # capture is done.
+            task = asyncio.create_task(self._recycle(browser, context))
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _recycle(self, browser: Browser, context: BrowserContext) -> None:
+        """Close a used pooled context and refill the pool if there is room.
+
+        Closing a context also closes its pages. Runs as a background task, so
+        failures are logged rather than raised.
+        """
+        try:
+            if len(self._context_pool) >= self._pool_size:
+                await context.close()
+                log_extra("Pool full, closed context")
+                return
+
+            _, fresh = await asyncio.gather(
+                context.close(), browser.new_context(viewport=settings.video_size)
+            )
             async with self._pool_lock:
-                if len(self._context_pool) < self._pool_size:
-                    self._context_pool.append(context)
-                    log_extra("Returned context to pool", pool_size=len(self._context_pool))
-                else:
-                    await context.close()
-                    log_extra("Pool full, closed context")
+                pooled = len(self._context_pool) < self._pool_size
+                if pooled:
+                    self._context_pool.append(fresh)
+                    log_extra("Refilled context pool", pool_size=len(self._context_pool))
+            if not pooled:
+                await fresh.close()
+        except Exception as e:
+            log_extra("Failed to recycle pooled context", error=str(e))
 
     async def record_interaction(
         self,
         url: str,
-        actions: list[dict[str, Any]] | None = None,
+        actions: Sequence[Action | dict[str, Any]] | None = None,
         wait_time: float = 3.0,
         video_dir: Path | None = None,
         device: str | None = None,
@@ -223,7 +288,7 @@ class BrowserRecorder:
 
             # Perform any specified actions
             if actions:
-                for action in actions:
+                for action in ACTIONS_ADAPTER.validate_python(actions):
                     await self._perform_action(page, action)
 
             # Wait for animations to complete
@@ -237,45 +302,23 @@ class BrowserRecorder:
 
         raise RuntimeError("Failed to record video")
 
-    async def take_screenshot(
+    @asynccontextmanager
+    async def _loaded_page(
         self,
         url: str,
-        full_page: bool = True,
         device: str | None = None,
         use_pool: bool = False,
-    ) -> Path:
-        """Take a screenshot of a page.
-
-        Args:
-            url: URL to screenshot
-            full_page: Capture full scrollable page or just viewport
-            device: Device profile name for mobile emulation
-            use_pool: Use connection pooling for better performance (default: False)
-                Note: Pooling ignores device-specific settings for reuse efficiency
-        """
+    ) -> AsyncGenerator[Page, None]:
+        """Yield a page that has finished loading url, closing it afterwards."""
         if use_pool and device is None:
             # Use pooled context for better performance (no device emulation)
             async with self.pooled_context() as (_, page):
                 await page.goto(url, wait_until="networkidle")
-
-                fd, tmp_path = tempfile.mkstemp(suffix=".png")
-                os.close(fd)
-                screenshot_path = Path(tmp_path)
-                await page.screenshot(path=str(screenshot_path), full_page=full_page)
-
-                log_extra(
-                    "Screenshot captured (pooled)",
-                    url=url,
-                    full_page=full_page,
-                )
-                return screenshot_path
+                yield page
+            return
 
         # Non-pooled path (original behavior with device support)
-        if not self._browser:
-            await self.start()
-
-        if self._browser is None:
-            raise RuntimeError("Browser not initialized")
+        browser = await self._ensure_started()
 
         # Resolve device profile
         profile = self._resolve_device(device)
@@ -289,51 +332,85 @@ class BrowserRecorder:
             context_options["is_mobile"] = profile.is_mobile
             context_options["has_touch"] = profile.has_touch
 
-        context = await self._browser.new_context(**context_options)
+        context = await browser.new_context(**context_options)
         page = await context.new_page()
 
         try:
             await page.goto(url, wait_until="networkidle")
+            yield page
+        finally:
+            await context.close()
 
+    async def take_screenshot(
+        self,
+        url: str,
+        full_page: bool = True,
+        device: str | None = None,
+        use_pool: bool = False,
+    ) -> Path:
+        """Take a screenshot of a page.
+
+        Args:
+            url: URL to screenshot
+            full_page: Capture full scrollable page or just viewport
+            device: Device profile name for mobile emulation
+            use_pool: Use connection pooling for better performance (default: False)
+                Note: Pooling ignores device-specific settings for reuse efficiency
+        """
+        async with self._loaded_page(url, device, use_pool) as page:
             fd, tmp_path = tempfile.mkstemp(suffix=".png")
             os.close(fd)
             screenshot_path = Path(tmp_path)
             await page.screenshot(path=str(screenshot_path), full_page=full_page)
 
-            log_extra(
-                "Screenshot captured",
-                url=url,
-                device=profile.name if profile else "default",
-                full_page=full_page,
-            )
-            return screenshot_path
-        finally:
-            await context.close()
+        log_extra(
+            "Screenshot captured",
+            url=url,
+            device=device or "default",
+            full_page=full_page,
+            pooled=use_pool and device is None,
+        )
+        return screenshot_path
+
+    async def take_screenshot_bytes(
+        self,
+        url: str,
+        full_page: bool = True,
+        device: str | None = None,
+        use_pool: bool = False,
+    ) -> bytes:
+        """Take a screenshot of a page and return the PNG bytes without touching disk.
+
+        Args are the same as take_screenshot().
+        """
+        async with self._loaded_page(url, device, use_pool) as page:
+            image_data = await page.screenshot(full_page=full_page)
+
+        log_extra(
+            "Screenshot captured",
+            url=url,
+            device=device or "default",
+            full_page=full_page,
+            pooled=use_pool and device is None,
+        )
+        return image_data
 
-    async def _perform_action(self, page: Page, action: dict[str, Any]) -> None:
+    async def _perform_action(self, page: Page, action: Action) -> None:
         """Perform a single browser action."""
-        action_type = action.get("type", "")
+        action_type = action.type
+        selector = action.selector
 
-        if action_type == "click":
-            selector = action.get("selector")
-            if selector:
-                await page.click(selector)
+        if action_type == "click" and selector:
+            await page.click(selector)
 
-        elif action_type == "type":
-            selector = action.get("selector")
-            text = action.get("text", "")
-            if selector:
-                await page.fill(selector, text)
+        elif action_type == "type" and selector:
+            await page.fill(selector, action.text)
 
         elif action_type == "scroll":
-            y = action.get("y", 500)
-            await page.evaluate(f"window.scrollBy(0, {y})")
+            await page.evaluate(f"window.scrollBy(0, {action.y})")
 
         elif action_type == "wait":
-            duration = action.get("duration", 1.0)
-            await asyncio.sleep(duration)
+            await asyncio.sleep(action.duration)
 
-        elif action_type == "hover":
-            selector = action.get("selector")
-            if selector:
-                await page.hover(selector)
+        elif action_type == "hover" and selector:
+            await page.hover(selector)
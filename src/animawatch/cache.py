@@ -7,6 +7,8 @@ Cache keys are generated from content hashes and prompts.
 import asyncio
 import hashlib
 import time
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Generic, TypeVar
@@ -14,6 +16,8 @@ from typing import Generic, TypeVar
 from .logging import log_extra
 
 T = TypeVar("T")
+K = TypeVar("K")
+V = TypeVar("V")
 
 
 @dataclass
@@ -30,6 +34,37 @@ class CacheEntry(Generic[T]):
         return time.monotonic() > self.expires_at
 
 
+class LRUDict(OrderedDict[K, V]):
+    """Dict bounded to max_size entries, evicting the least recently used.
+
+    Lookups and writes refresh an entry's recency. on_evict, if given, is
+    called with each evicted key and value.
+    """
+
+    def __init__(self, max_size: int, on_evict: Callable[[K, V], None] | None = None) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self._on_evict = on_evict
+
+    def __getitem__(self, key: K) -> V:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key: K, default: V | None = None) -> V | None:  # type: ignore[override]
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            evicted_key, evicted_value = self.popitem(last=False)
+            if self._on_evict is not None:
+                self._on_evict(evicted_key, evicted_value)
+
+
 class AnalysisCache:
     """Thread-safe TTL cache for vision analysis results.
 
@@ -57,19 +92,39 @@ class AnalysisCache:
         self._misses = 0
 
     @staticmethod
-    def _hash_content(content: bytes, prompt: str) -> str:
-        """Generate a cache key from content and prompt."""
-        hasher = hashlib.sha256()
-        hasher.update(content)
+    def _hash_content(
+        content: bytes, prompt: str, structured: bool = False, model: str = ""
+    ) -> str:
+        """Generate a cache key from content, prompt, output mode and model."""
+        return AnalysisCache._finish_key(hashlib.sha256(content), prompt, structured, model)
+
+    @staticmethod
+    def _finish_key(hasher: "hashlib._Hash", prompt: str, structured: bool, model: str) -> str:
+        """Mix prompt, output mode and model into a content digest and render the key."""
         hasher.update(prompt.encode("utf-8"))
+        hasher.update(b"\x01" if structured else b"\x00")
+        hasher.update(model.encode("utf-8"))
         return hasher.hexdigest()[:32]
 
     @staticmethod
-    def hash_file(file_path: Path, prompt: str) -> str:
-        """Generate a cache key from a file and prompt."""
+    def hash_bytes(content: bytes, prompt: str, structured: bool = False, model: str = "") -> str:
+        """Generate a cache key from in-memory content and prompt.
+
+        Providers pass their model name so answers from different models
+        for the same input never share an entry.
+        """
+        return AnalysisCache._hash_content(content, prompt, structured, model)
+
+    @staticmethod
+    def hash_file(file_path: Path, prompt: str, structured: bool = False, model: str = "") -> str:
+        """Generate a cache key from a file and prompt.
+
+        The file is streamed through the digest in chunks, so large videos are
+        never held in memory whole.
+        """
         with open(file_path, "rb") as f:
-            content = f.read()
-        return AnalysisCache._hash_content(content, prompt)
+            hasher = hashlib.file_digest(f, "sha256")
+        return AnalysisCache._finish_key(hasher, prompt, structured, model)
 
     async def get(self, key: str) -> str | None:
         """Get a cached value if it exists and hasn't expired."""
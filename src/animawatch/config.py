@@ -66,6 +66,21 @@ class Settings(BaseSettings):
         default=None,
         description="Directory to store recordings (default: temp)",
     )
+    max_stored_recordings: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum recordings kept addressable via resources (LRU evicted)",
+    )
+    max_stored_analyses: int = Field(
+        default=500,
+        ge=1,
+        description="Maximum analyses kept addressable via resources (LRU evicted)",
+    )
+    tool_cache_ttl: float = Field(
+        default=600.0,
+        ge=0,
+        description="Seconds to reuse a watch/check_accessibility result for an identical request",
+    )
 
     @property
     def video_size(self) -> ViewportSize:
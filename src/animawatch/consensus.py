@@ -10,7 +10,15 @@ from pathlib import Path
 
 from .logging import log_extra
 from .models import AnalysisResult, Finding, Severity
-from .vision import VisionProvider, get_vision_provider
+from .vision import OllamaProvider, VisionProvider, get_vision_provider
+
+# Rank used to pick the more severe of two matched findings
+_SEVERITY_ORDER: dict[Severity, int] = {
+    Severity.CRITICAL: 4,
+    Severity.MAJOR: 3,
+    Severity.MINOR: 2,
+    Severity.INFO: 1,
+}
 
 
 @dataclass
@@ -27,7 +35,7 @@ class ConsensusResult:
 
 
 async def analyze_with_consensus(
-    image_path: Path,
+    image_path: Path | bytes,
     prompt: str,
     gemini_provider: VisionProvider | None = None,
     ollama_provider: VisionProvider | None = None,
@@ -36,7 +44,7 @@ async def analyze_with_consensus(
     """Analyze an image with multiple models and merge results.
 
     Args:
-        image_path: Path to the image to analyze
+        image_path: Path to the image to analyze, or PNG bytes in memory
         prompt: Analysis prompt
         gemini_provider: Optional Gemini provider (created if not provided)
         ollama_provider: Optional Ollama provider (created if not provided)
@@ -61,17 +69,12 @@ async def analyze_with_consensus(
 
     async def run_ollama() -> AnalysisResult | None:
         try:
-            from .config import settings
-
-            # Temporarily switch to Ollama
-            original = settings.vision_provider
-            settings.vision_provider = "ollama"
-            try:
-                provider = ollama_provider or get_vision_provider()
-                result = await provider.analyze_image(image_path, prompt, structured=True)
-                return result if isinstance(result, AnalysisResult) else None
-            finally:
-                settings.vision_provider = original
+            # Construct Ollama directly rather than flipping the global
+            # settings.vision_provider, which would leak into the concurrent
+            # Gemini call and any other request running on the loop
+            provider = ollama_provider or OllamaProvider()
+            result = await provider.analyze_image(image_path, prompt, structured=True)
+            return result if isinstance(result, AnalysisResult) else None
         except Exception as e:
             log_extra("Ollama analysis failed", error=str(e))
             return None
@@ -166,10 +169,4 @@ def _findings_similar(f1: Finding, f2: Finding, threshold: float) -> bool:
 
 def _max_severity(s1: Severity, s2: Severity) -> Severity:
     """Return the more severe of two severities."""
-    severity_order = {
-        Severity.CRITICAL: 4,
-        Severity.MAJOR: 3,
-        Severity.MINOR: 2,
-        Severity.INFO: 1,
-    }
-    return s1 if severity_order.get(s1, 0) >= severity_order.get(s2, 0) else s2
+    return s1 if _SEVERITY_ORDER.get(s1, 0) >= _SEVERITY_ORDER.get(s2, 0) else s2
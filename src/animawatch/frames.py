@@ -245,7 +245,7 @@ async def cleanup_frames(extraction_result: FrameExtractionResult) -> None:
 
     for frame in extraction_result.frames:
         with contextlib.suppress(OSError):
-            frame.path.unlink()
+            frame.path.unlink(missing_ok=True)
 
     # Try to remove the parent directory if empty
     if extraction_result.frames:
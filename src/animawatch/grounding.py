@@ -7,13 +7,14 @@ This module provides utilities to reduce vision AI hallucinations by:
 4. Multi-pass analysis for verification
 """
 
+import functools
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from pydantic import Field
 
-from .models import BoundingBox, Finding, IssueCategory, Severity
+from .models import AnalysisResult, BoundingBox, Finding, IssueCategory, Severity
 
 if TYPE_CHECKING:
     from .vision import VisionProvider
@@ -30,7 +31,7 @@ class GroundedFinding(Finding):
     verification_reason: str = Field(default="", description="Reason for verification status")
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Result of verifying a finding."""
 
@@ -90,6 +91,10 @@ If you cannot determine coordinates, mark as "location_uncertain": true.
 """
 
 
+# Line prefixes that start a new finding in free-form model output
+_BULLETS = ("-", "*", "•")
+
+
 def create_grounded_prompt(base_prompt: str, image_width: int, image_height: int) -> str:
     """Create a prompt that enforces grounding and bounding box annotation."""
     return f"""{base_prompt}
@@ -103,8 +108,10 @@ def create_grounded_prompt(base_prompt: str, image_width: int, image_height: int
 def create_verification_prompt(findings: list[Finding]) -> str:
     """Create a prompt to verify existing findings."""
     findings_text = "\n".join(
-        f"{i + 1}. [{f.severity}] {f.description} at {f.element or 'unknown location'}"
-        for i, f in enumerate(findings)
+        [
+            f"{i + 1}. [{f.severity}] {f.description} at {f.element or 'unknown location'}"
+            for i, f in enumerate(findings)
+        ]
     )
     return VERIFICATION_PROMPT.format(findings=findings_text)
 
@@ -125,11 +132,15 @@ def parse_bounding_box(text: str) -> BoundingBox | None:
 def apply_verification_result(
     finding: Finding, verification: VerificationResult
 ) -> GroundedFinding:
-    """Apply verification result to upgrade finding to grounded finding."""
+    """Apply verification result to upgrade finding to grounded finding.
+
+    The source finding is already validated, so the grounded copy is built
+    without re-running validation.
+    """
     conf_adj = finding.confidence + verification.confidence_adjustment
     adjusted_confidence = int(min(100, max(0, conf_adj)))
 
-    return GroundedFinding(
+    return GroundedFinding.model_construct(
         id=finding.id,
         category=finding.category,
         severity=finding.severity if verification.is_verified else Severity.INFO,
@@ -166,11 +177,8 @@ async def multi_pass_analysis(
     Returns:
         List of verified grounded findings
     """
-    from PIL import Image
-
     # Get image dimensions for bounding box prompts
-    with Image.open(image_path) as img:
-        width, height = img.size
+    width, height = _image_size(str(image_path), image_path.stat().st_mtime_ns)
 
     # Pass 1: Initial grounded analysis
     grounded_prompt = create_grounded_prompt(base_prompt, width, height)
@@ -211,10 +219,20 @@ async def multi_pass_analysis(
     return verified_findings
 
 
+@functools.lru_cache(maxsize=256)
+def _image_size(path: str, mtime_ns: int) -> tuple[int, int]:
+    """Read image dimensions from the file header without decoding pixels.
+
+    Keyed on modification time so a rewritten file is re-read.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        return img.size
+
+
 def _result_to_str(result: str | object) -> str:
     """Convert vision provider result to string."""
-    from .models import AnalysisResult
-
     if isinstance(result, AnalysisResult):
         return result.summary
     return str(result) if result else ""
@@ -222,7 +240,7 @@ def _result_to_str(result: str | object) -> str:
 
 def _finding_to_grounded(finding: Finding, image_path: Path) -> GroundedFinding:
     """Convert a regular finding to a grounded finding."""
-    return GroundedFinding(
+    return GroundedFinding.model_construct(
         id=finding.id,
         category=finding.category,
         severity=finding.severity,
@@ -241,8 +259,6 @@ def _finding_to_grounded(finding: Finding, image_path: Path) -> GroundedFinding:
 
 def _parse_findings_from_result(result: str | object) -> list[Finding]:
     """Parse findings from vision AI result text."""
-    from .models import AnalysisResult
-
     # If result is already an AnalysisResult, extract findings
     if isinstance(result, AnalysisResult):
         return result.findings
@@ -261,7 +277,7 @@ def _parse_findings_from_result(result: str | object) -> list[Finding]:
 
     for line in lines:
         line = line.strip()
-        if line.startswith("-") or line.startswith("*") or line.startswith("•"):
+        if line.startswith(_BULLETS):
             if current_issue:
                 findings.append(
                     Finding(
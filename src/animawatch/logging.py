@@ -31,6 +31,11 @@ if not logger.handlers:
         class JsonFormatter(logging.Formatter):
             """Format log records as JSON for structured logging."""
 
+            def __init__(self) -> None:
+                super().__init__()
+                # Bind the serializer once instead of resolving it per record
+                self._dumps = json.dumps
+
             def format(self, record: logging.LogRecord) -> str:
                 log_data: dict[str, Any] = {
                     "timestamp": self.formatTime(record),
@@ -42,7 +47,7 @@ if not logger.handlers:
                 if hasattr(record, "extra_data"):
                     extra_data: dict[str, Any] = getattr(record, "extra_data", {})
                     log_data.update(extra_data)
-                return json.dumps(log_data)
+                return self._dumps(log_data)
 
         handler.setFormatter(JsonFormatter())
     else:
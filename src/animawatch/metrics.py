@@ -5,12 +5,13 @@ metrics like LCP, FID, CLS, and other Core Web Vitals from browser sessions.
 """
 
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from playwright.async_api import Page
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 
-@dataclass
+@dataclass(slots=True)
 class CoreWebVitals:
     """Core Web Vitals metrics."""
 
@@ -22,7 +23,7 @@ class CoreWebVitals:
     inp_ms: float | None = None  # Interaction to Next Paint
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Complete performance metrics for a page."""
 
@@ -37,7 +38,7 @@ class PerformanceMetrics:
     raw_entries: list[dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetricsThresholds:
     """Thresholds for good/needs-improvement/poor ratings."""
 
@@ -51,6 +52,13 @@ class MetricsThresholds:
     fcp_poor_ms: float = 3000.0
 
 
+# Emoji shown next to each rating in reports
+_RATING_EMOJI = {"good": "✅", "needs-improvement": "🟡", "poor": "🔴"}
+
+# Shared default thresholds (immutable, so safe to reuse across calls)
+_DEFAULT_THRESHOLDS = MetricsThresholds()
+
+
 def rate_metric(value: float | None, good: float, poor: float) -> str:
     """Rate a metric as good, needs-improvement, or poor."""
     if value is None:
@@ -75,7 +83,7 @@ def rate_web_vitals(
     Returns:
         Dict mapping metric names to ratings
     """
-    t = thresholds or MetricsThresholds()
+    t = thresholds or _DEFAULT_THRESHOLDS
 
     return {
         "lcp": rate_metric(vitals.lcp_ms, t.lcp_good_ms, t.lcp_poor_ms),
@@ -85,7 +93,7 @@ def rate_web_vitals(
     }
 
 
-async def extract_performance_metrics(page: Page, url: str) -> PerformanceMetrics:
+async def extract_performance_metrics(page: "Page", url: str) -> PerformanceMetrics:
     """Extract performance metrics from a Playwright page.
 
     Args:
@@ -172,7 +180,7 @@ async def extract_performance_metrics(page: Page, url: str) -> PerformanceMetric
 
 
 async def collect_metrics_during_interaction(
-    page: Page,
+    page: "Page",
     interaction_fn: Any,
 ) -> CoreWebVitals:
     """Collect metrics while user interaction is happening.
@@ -222,55 +230,43 @@ def generate_metrics_report(metrics: PerformanceMetrics) -> str:
         Formatted report string
     """
     vitals = metrics.core_web_vitals
-    ratings = rate_web_vitals(vitals)
+    t = _DEFAULT_THRESHOLDS
 
-    lines = [
+    # Optional lines are None and dropped in a single join at the end
+    lines: list[str | None] = [
         "📊 Performance Metrics Report",
         "=" * 40,
         f"URL: {metrics.url}",
         "",
         "Core Web Vitals:",
+        _vital_line("LCP", vitals.lcp_ms, ".0f", "ms", t.lcp_good_ms, t.lcp_poor_ms),
+        _vital_line("FCP", vitals.fcp_ms, ".0f", "ms", t.fcp_good_ms, t.fcp_poor_ms),
+        _vital_line("CLS", vitals.cls_score, ".3f", "", t.cls_good, t.cls_poor),
+        _vital_line("FID", vitals.fid_ms, ".0f", "ms", t.fid_good_ms, t.fid_poor_ms),
+        f"  ⏱️  TTFB: {vitals.ttfb_ms:.0f}ms" if vitals.ttfb_ms is not None else None,
+        "",
+        "Page Metrics:",
+        f"  📦 Load Time: {metrics.load_time_ms:.0f}ms",
+        f"  📄 DOM Content Loaded: {metrics.dom_content_loaded_ms:.0f}ms",
+        f"  🔗 Resources: {metrics.resource_count}",
+        f"  📡 Transfer Size: {metrics.total_transfer_size_kb:.1f}KB",
+        f"  🌳 DOM Nodes: {metrics.dom_node_count}" if metrics.dom_node_count else None,
+        f"  💾 JS Heap: {metrics.js_heap_size_mb:.1f}MB" if metrics.js_heap_size_mb else None,
     ]
 
-    if vitals.lcp_ms is not None:
-        rating = _rating_emoji(ratings["lcp"])
-        lines.append(f"  {rating} LCP: {vitals.lcp_ms:.0f}ms ({ratings['lcp']})")
-
-    if vitals.fcp_ms is not None:
-        rating = _rating_emoji(ratings["fcp"])
-        lines.append(f"  {rating} FCP: {vitals.fcp_ms:.0f}ms ({ratings['fcp']})")
-
-    if vitals.cls_score is not None:
-        rating = _rating_emoji(ratings["cls"])
-        lines.append(f"  {rating} CLS: {vitals.cls_score:.3f} ({ratings['cls']})")
-
-    if vitals.fid_ms is not None:
-        rating = _rating_emoji(ratings["fid"])
-        lines.append(f"  {rating} FID: {vitals.fid_ms:.0f}ms ({ratings['fid']})")
-
-    if vitals.ttfb_ms is not None:
-        lines.append(f"  ⏱️  TTFB: {vitals.ttfb_ms:.0f}ms")
-
-    lines.extend(
-        [
-            "",
-            "Page Metrics:",
-            f"  📦 Load Time: {metrics.load_time_ms:.0f}ms",
-            f"  📄 DOM Content Loaded: {metrics.dom_content_loaded_ms:.0f}ms",
-            f"  🔗 Resources: {metrics.resource_count}",
-            f"  📡 Transfer Size: {metrics.total_transfer_size_kb:.1f}KB",
-        ]
-    )
-
-    if metrics.dom_node_count:
-        lines.append(f"  🌳 DOM Nodes: {metrics.dom_node_count}")
+    return "\n".join([line for line in lines if line is not None])
 
-    if metrics.js_heap_size_mb:
-        lines.append(f"  💾 JS Heap: {metrics.js_heap_size_mb:.1f}MB")
 
-    return "\n".join(lines)
+def _vital_line(
+    label: str, value: float | None, spec: str, unit: str, good: float, poor: float
+) -> str | None:
+    """Format a rated Core Web Vital line, or None if the metric wasn't captured."""
+    if value is None:
+        return None
+    rating = rate_metric(value, good, poor)
+    return f"  {_rating_emoji(rating)} {label}: {value:{spec}}{unit} ({rating})"
 
 
 def _rating_emoji(rating: str) -> str:
     """Get emoji for rating."""
-    return {"good": "✅", "needs-improvement": "🟡", "poor": "🔴"}.get(rating, "❓")
+    return _RATING_EMOJI.get(rating, "❓")
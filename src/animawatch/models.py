@@ -4,10 +4,11 @@ Provides type-safe, validated response models for vision AI analysis results.
 All findings include confidence scores (0-100) for hallucination prevention.
 """
 
+from collections import Counter
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class Severity(str, Enum):
@@ -19,6 +20,27 @@ class Severity(str, Enum):
     INFO = "info"
 
 
+# Icons used when rendering findings
+_SEVERITY_ICONS: dict[Severity, str] = {
+    Severity.CRITICAL: "🔴",
+    Severity.MAJOR: "🟠",
+    Severity.MINOR: "🟡",
+    Severity.INFO: "🔵",
+}
+
+
+# Markdown block for a single finding in AnalysisResult.to_markdown()
+_FINDING_MD_TEMPLATE = (
+    "#### {index}. {icon} {element}\n"
+    "- **Category**: {category}\n"
+    "- **Severity**: {severity}\n"
+    "- **Confidence**: {confidence}%\n"
+    "{timestamp}"
+    "- **Issue**: {description}\n"
+    "- **Fix**: {suggestion}\n"
+)
+
+
 class IssueCategory(str, Enum):
     """Categories of visual issues."""
 
@@ -33,6 +55,8 @@ class IssueCategory(str, Enum):
 class BoundingBox(BaseModel):
     """Bounding box coordinates for issue location."""
 
+    model_config = ConfigDict(frozen=True)
+
     x: int = Field(ge=0, description="X coordinate (pixels from left)")
     y: int = Field(ge=0, description="Y coordinate (pixels from top)")
     width: int = Field(gt=0, description="Width in pixels")
@@ -42,6 +66,8 @@ class BoundingBox(BaseModel):
 class Finding(BaseModel):
     """A single finding from visual analysis with confidence scoring."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Unique identifier for this finding")
     category: IssueCategory = Field(description="Category of the issue")
     severity: Severity = Field(description="Issue severity level")
@@ -63,6 +89,8 @@ class Finding(BaseModel):
 class AnalysisMetadata(BaseModel):
     """Metadata about the analysis process."""
 
+    model_config = ConfigDict(frozen=True)
+
     provider: str = Field(description="Vision provider used (gemini/ollama)")
     model: str = Field(description="Model name used for analysis")
     analysis_duration_ms: int = Field(description="Time taken for analysis in milliseconds")
@@ -75,6 +103,8 @@ class AnalysisMetadata(BaseModel):
 class AnalysisResult(BaseModel):
     """Complete structured analysis result with all findings."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(description="Unique analysis ID")
     url: str | None = Field(default=None, description="URL that was analyzed")
     success: bool = Field(description="Whether analysis completed successfully")
@@ -105,38 +135,65 @@ class AnalysisResult(BaseModel):
             return 100.0
         return sum(f.confidence for f in self.findings) / len(self.findings)
 
+    def _tally(self) -> tuple[Counter[Severity], float]:
+        """Count findings per severity and average their confidence in one pass."""
+        counts: Counter[Severity] = Counter()
+        confidence = 0
+        for f in self.findings:
+            counts[f.severity] += 1
+            confidence += f.confidence
+        return counts, confidence / len(self.findings) if self.findings else 100.0
+
     def to_markdown(self) -> str:
         """Convert analysis result to formatted markdown."""
-        lines = [
-            "## Analysis Result",
-            "",
-            f"**Score**: {self.overall_score}/100",
-            f"**Findings**: {len(self.findings)} ({self.critical_count} critical, "
-            f"{self.major_count} major, {self.minor_count} minor)",
-            f"**Avg Confidence**: {self.average_confidence:.1f}%",
-            "",
-            "### Summary",
-            f"{self.summary}",
-            "",
+        counts, average_confidence = self._tally()
+        header = (
+            "## Analysis Result\n\n"
+            f"**Score**: {self.overall_score}/100\n"
+            f"**Findings**: {len(self.findings)} ({counts[Severity.CRITICAL]} critical, "
+            f"{counts[Severity.MAJOR]} major, {counts[Severity.MINOR]} minor)\n"
+            f"**Avg Confidence**: {average_confidence:.1f}%\n\n"
+            "### Summary\n"
+            f"{self.summary}\n"
+        )
+        if not self.findings:
+            return header
+
+        blocks = [
+            _FINDING_MD_TEMPLATE.format(
+                index=i,
+                icon=_SEVERITY_ICONS.get(finding.severity, "⚪"),
+                element=finding.element,
+                category=finding.category.value,
+                severity=finding.severity.value,
+                confidence=finding.confidence,
+                timestamp=(
+                    f"- **Timestamp**: {finding.timestamp:.1f}s\n"
+                    if finding.timestamp is not None
+                    else ""
+                ),
+                description=finding.description,
+                suggestion=finding.suggestion,
+            )
+            for i, finding in enumerate(self.findings, 1)
         ]
+        return header + "\n### Findings\n\n" + "\n".join(blocks)
+
+
+class Action(BaseModel):
+    """A browser action performed before a recording settles."""
+
+    model_config = ConfigDict(frozen=True)
+
+    type: str = Field(description="Action type: click, type, scroll, wait or hover")
+    selector: str | None = Field(default=None, description="CSS selector for click, type and hover")
+    text: str = Field(default="", description="Text to enter for type actions")
+    y: int = Field(default=500, description="Pixels to scroll for scroll actions")
+    duration: float = Field(default=1.0, ge=0, description="Seconds to pause for wait actions")
+
 
-        if self.findings:
-            lines.append("### Findings")
-            lines.append("")
-            for i, finding in enumerate(self.findings, 1):
-                severity_icon = {"critical": "🔴", "major": "🟠", "minor": "🟡", "info": "🔵"}
-                icon = severity_icon.get(finding.severity.value, "⚪")
-                lines.append(f"#### {i}. {icon} {finding.element}")
-                lines.append(f"- **Category**: {finding.category.value}")
-                lines.append(f"- **Severity**: {finding.severity.value}")
-                lines.append(f"- **Confidence**: {finding.confidence}%")
-                if finding.timestamp is not None:
-                    lines.append(f"- **Timestamp**: {finding.timestamp:.1f}s")
-                lines.append(f"- **Issue**: {finding.description}")
-                lines.append(f"- **Fix**: {finding.suggestion}")
-                lines.append("")
-
-        return "\n".join(lines)
+# Built once so per-call validation reuses the compiled core schema
+ACTIONS_ADAPTER: TypeAdapter[list[Action]] = TypeAdapter(list[Action])
 
 
 # JSON schema for prompting vision models to return structured output
@@ -1,8 +1,9 @@
 """Retry logic with exponential backoff and circuit breaker pattern.
 
 Provides robust retry mechanisms for API calls with:
-- Exponential backoff with jitter
+- Exponential backoff with full, decorrelated, or symmetric jitter
 - Circuit breaker to prevent cascading failures
+- Adaptive retry controller that suppresses retries during failure storms
 - Configurable retry conditions
 """
 
@@ -10,8 +11,10 @@ import asyncio
 import functools
 import random
 import time
+from collections import deque
 from collections.abc import Callable, Coroutine
-from typing import Any, ParamSpec, TypeVar
+from enum import IntEnum
+from typing import Any, Literal, ParamSpec, TypeVar
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -20,6 +23,9 @@ from .logging import log_extra, logger
 P = ParamSpec("P")
 R = TypeVar("R")
 
+# Pre-bound uniform [0, 1) source for retry jitter
+_rand = random.Random().random
+
 
 class RetryConfig(BaseModel):
     """Configuration for retry behavior with validation."""
@@ -28,7 +34,16 @@ class RetryConfig(BaseModel):
     base_delay: float = Field(default=1.0, ge=0, description="Initial delay in seconds")
     max_delay: float = Field(default=30.0, ge=0, description="Maximum delay in seconds")
     exponential_base: float = Field(default=2.0, gt=1, description="Exponential backoff multiplier")
-    jitter: float = Field(default=0.5, ge=0, le=1, description="Random jitter factor (0-1)")
+    jitter: float = Field(
+        default=0.5, ge=0, le=1, description="Jitter factor (0-1) for symmetric mode"
+    )
+    jitter_mode: Literal["full", "decorrelated", "symmetric"] = Field(
+        default="full",
+        description=(
+            "full: uniform in [0, backoff]; decorrelated: uniform in "
+            "[base_delay, 3 * previous delay]; symmetric: backoff +/- jitter * backoff"
+        ),
+    )
     retry_exceptions: tuple[type[Exception], ...] = Field(
         default=(ConnectionError, TimeoutError, OSError),
         description="Exceptions that trigger a retry",
@@ -46,17 +61,46 @@ class RetryConfig(BaseModel):
         return self
 
 
+# Circuit states, stored as small ints so the per-call checks are int compares
+_CLOSED, _OPEN, _HALF_OPEN = 0, 1, 2
+_STATE_NAMES = ("CLOSED", "OPEN", "HALF_OPEN")
+
+
+class Admission(IntEnum):
+    """Result of CircuitBreaker.try_acquire(); falsy only when rejected."""
+
+    REJECTED = 0
+    ADMITTED = 1
+    # Holds the single HALF_OPEN probe slot; the caller must call release()
+    PROBE = 2
+
+
 class CircuitBreaker:
     """Circuit breaker to prevent cascading failures.
 
     States:
     - CLOSED: Normal operation, requests pass through
     - OPEN: Circuit is open, requests fail immediately
-    - HALF_OPEN: Testing if service recovered
-
-    Thread-safe for use in async contexts.
+    - HALF_OPEN: Testing if service recovered; exactly one probe request is
+      admitted at a time. A failed probe reopens the circuit, and each
+      successful probe decays the failure count until it reaches zero and the
+      circuit closes.
+
+    Safe for concurrent coroutines on one event loop without a lock: every
+    state transition is plain synchronous code with no await points, so no
+    other coroutine can observe a half-applied update.
     """
 
+    __slots__ = (
+        "_failures",
+        "_half_open_inflight",
+        "_last_failure_time_ns",
+        "_recovery_timeout_ns",
+        "_state",
+        "failure_threshold",
+        "name",
+    )
+
     def __init__(
         self,
         failure_threshold: int = 3,
@@ -67,47 +111,91 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.name = name
         self._failures = 0
-        self._last_failure_time: float = 0
-        self._state = "CLOSED"
-        self._lock = asyncio.Lock()
+        self._last_failure_time_ns = 0
+        self._state = _CLOSED
+        self._half_open_inflight = 0
+
+    @property
+    def recovery_timeout(self) -> float:
+        """Seconds to wait before allowing a request through an open circuit."""
+        return self._recovery_timeout_ns / 1e9
+
+    @recovery_timeout.setter
+    def recovery_timeout(self, seconds: float) -> None:
+        # Stored as integer nanoseconds to compare against time.monotonic_ns()
+        self._recovery_timeout_ns = int(seconds * 1e9)
+
+    @property
+    def state(self) -> str:
+        """Current state: CLOSED, OPEN or HALF_OPEN."""
+        return _STATE_NAMES[self._state]
+
+    def _maybe_half_open(self) -> None:
+        """Move OPEN to HALF_OPEN once the recovery timeout has passed."""
+        if self._state == _OPEN:
+            elapsed_ns = time.monotonic_ns() - self._last_failure_time_ns
+            if elapsed_ns >= self._recovery_timeout_ns:
+                self._state = _HALF_OPEN
 
     @property
     def is_open(self) -> bool:
-        """Check if circuit is open (blocking requests).
+        """Check if a request would currently be rejected.
 
-        Note: This is a synchronous check for use in non-async contexts.
-        For async contexts, use async_is_open().
+        Does not reserve the half-open probe slot; use try_acquire() for that.
+        Safe to call directly from coroutines (see class docstring).
         """
-        if self._state == "OPEN":
-            # Check if recovery timeout has passed (using monotonic clock)
-            if time.monotonic() - self._last_failure_time >= self.recovery_timeout:
-                self._state = "HALF_OPEN"
-                return False
+        # Hot path: a closed circuit never needs the clock
+        if self._state == _CLOSED:
+            return False
+        self._maybe_half_open()
+        if self._state == _OPEN:
             return True
-        return False
+        return self._half_open_inflight >= 1
 
     async def async_is_open(self) -> bool:
-        """Thread-safe check if circuit is open (for async contexts)."""
-        async with self._lock:
-            return self.is_open
+        """Awaitable alias of is_open, kept for backward compatibility."""
+        return self.is_open
+
+    def try_acquire(self) -> Admission:
+        """Admit a request, reserving the single probe slot when HALF_OPEN.
+
+        Returns Admission.PROBE when the probe slot was reserved; that caller
+        must call release() when it finishes.
+        """
+        if self._state == _CLOSED:
+            return Admission.ADMITTED
+        self._maybe_half_open()
+        if self._state == _OPEN or self._half_open_inflight >= 1:
+            return Admission.REJECTED
+        self._half_open_inflight += 1
+        return Admission.PROBE
+
+    def release(self) -> None:
+        """Release the probe slot reserved by try_acquire()."""
+        if self._half_open_inflight > 0:
+            self._half_open_inflight -= 1
 
     def record_success(self) -> None:
-        """Record a successful request."""
-        self._failures = 0
-        self._state = "CLOSED"
+        """Record a successful request, decaying the failure count by one."""
+        if self._failures > 0:
+            self._failures -= 1
+        if self._failures == 0 and self._state != _CLOSED:
+            self._state = _CLOSED
+            log_extra(f"Circuit breaker {self.name} closed")
 
     async def async_record_success(self) -> None:
-        """Thread-safe record of successful request."""
-        async with self._lock:
-            self.record_success()
+        """Awaitable alias of record_success, kept for backward compatibility."""
+        self.record_success()
 
     def record_failure(self) -> None:
         """Record a failed request."""
-        self._failures += 1
-        self._last_failure_time = time.monotonic()
+        self._failures = min(self._failures + 1, self.failure_threshold)
+        self._last_failure_time_ns = time.monotonic_ns()
 
-        if self._failures >= self.failure_threshold:
-            self._state = "OPEN"
+        if self._state == _HALF_OPEN or (
+            self._state == _CLOSED and self._failures >= self.failure_threshold
+        ):
+            self._state = _OPEN
             log_extra(
                 f"Circuit breaker {self.name} opened",
                 failures=self._failures,
@@ -115,9 +203,8 @@ class CircuitBreaker:
             )
 
     async def async_record_failure(self) -> None:
-        """Thread-safe record of failed request."""
-        async with self._lock:
-            self.record_failure()
+        """Awaitable alias of record_failure, kept for backward compatibility."""
+        self.record_failure()
 
     def reset(self) -> None:
         """Reset the circuit breaker to initial state.
@@ -125,8 +212,92 @@ class CircuitBreaker:
         Useful for testing to clear shared state between tests.
         """
         self._failures = 0
-        self._last_failure_time = 0
-        self._state = "CLOSED"
+        self._last_failure_time_ns = 0
+        self._state = _CLOSED
+        self._half_open_inflight = 0
+
+
+class RetryController:
+    """Disables retries while recent attempts are mostly failing.
+
+    Tracks the outcome of every attempt over a rolling window. When the
+    failure rate exceeds the threshold, retrying only multiplies load on a
+    service that is already down, so callers get a single attempt. Once per
+    cooldown one call is allowed to retry again to re-evaluate.
+
+    Like CircuitBreaker, state changes have no await points and need no lock.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        rejection_threshold: float = 0.5,
+        min_samples: int = 5,
+        cooldown_seconds: float = 30.0,
+        name: str = "default",
+    ) -> None:
+        self.rejection_threshold = rejection_threshold
+        self.min_samples = min_samples
+        self.name = name
+        self._window_ns = int(window_seconds * 1e9)
+        self._cooldown_ns = int(cooldown_seconds * 1e9)
+        self._outcomes: deque[tuple[int, bool]] = deque()
+        self._failures = 0
+        self._suppressed_at_ns: int | None = None
+
+    def _trim(self, now_ns: int) -> None:
+        """Drop outcomes that have fallen out of the window."""
+        cutoff = now_ns - self._window_ns
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, success = self._outcomes.popleft()
+            if not success:
+                self._failures -= 1
+
+    def record(self, success: bool) -> None:
+        """Record the outcome of a single attempt."""
+        self._outcomes.append((time.monotonic_ns(), success))
+        if not success:
+            self._failures += 1
+
+    @property
+    def rejection_rate(self) -> float:
+        """Fraction of attempts in the window that failed."""
+        self._trim(time.monotonic_ns())
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    def allow_retries(self) -> bool:
+        """Whether the next call may retry on failure."""
+        now_ns = time.monotonic_ns()
+        self._trim(now_ns)
+        total = len(self._outcomes)
+        storming = total >= self.min_samples and self._failures / total > self.rejection_threshold
+
+        if not storming:
+            if self._suppressed_at_ns is not None:
+                self._suppressed_at_ns = None
+                log_extra(f"Retry controller {self.name} re-enabled retries")
+            return True
+
+        if self._suppressed_at_ns is None:
+            self._suppressed_at_ns = now_ns
+            log_extra(
+                f"Retry controller {self.name} suppressing retries",
+                rejection_rate=round(self._failures / total, 2),
+                samples=total,
+            )
+            return False
+
+        if now_ns - self._suppressed_at_ns >= self._cooldown_ns:
+            # Let one call retry to re-evaluate, then start a new cooldown
+            self._suppressed_at_ns = now_ns
+            return True
+        return False
+
+    def reset(self) -> None:
+        """Clear all recorded outcomes."""
+        self._outcomes.clear()
+        self._failures = 0
+        self._suppressed_at_ns = None
 
 
 class CircuitOpenError(Exception):
@@ -138,24 +309,46 @@ class CircuitOpenError(Exception):
 def calculate_delay(
     attempt: int,
     config: RetryConfig,
+    prev_delay: float | None = None,
 ) -> float:
-    """Calculate delay with exponential backoff and jitter."""
-    delay = config.base_delay * (config.exponential_base**attempt)
-    delay = min(delay, config.max_delay)
+    """Calculate delay with exponential backoff and jitter.
+
+    Args:
+        attempt: Zero-based retry attempt
+        config: Retry configuration (selects the jitter mode)
+        prev_delay: Previous delay, used by decorrelated jitter
+            (defaults to base_delay)
+    """
+    backoff = min(config.base_delay * (config.exponential_base**attempt), config.max_delay)
+    return _jittered_delay(backoff, config.base_delay if prev_delay is None else prev_delay, config)
+
 
-    # Add jitter to prevent thundering herd
-    jitter_range = delay * config.jitter
-    delay += random.uniform(-jitter_range, jitter_range)
+def _jittered_delay(backoff: float, prev_delay: float, config: RetryConfig) -> float:
+    """Apply the configured jitter to a capped exponential backoff.
 
-    return max(0, delay)
+    Spreading retries across the whole window keeps clients that failed
+    together from retrying together (thundering herd).
+    """
+    if config.jitter_mode == "full":
+        return _rand() * backoff
+    if config.jitter_mode == "decorrelated":
+        upper = max(prev_delay * 3.0, config.base_delay)
+        delay = config.base_delay + _rand() * (upper - config.base_delay)
+        return min(config.max_delay, delay)
+    jitter_range = backoff * config.jitter
+    return max(0.0, backoff + (_rand() * 2.0 - 1.0) * jitter_range)
 
 
 def with_retry(
     config: RetryConfig | None = None,
     circuit_breaker: CircuitBreaker | None = None,
+    controller: RetryController | None = None,
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
     """Decorator that adds retry logic with optional circuit breaker.
 
+    If a RetryController is given, retries are skipped while it reports a
+    failure storm.
+
     Usage:
         @with_retry(RetryConfig(max_retries=3))
         async def call_api():
@@ -164,41 +357,84 @@ def with_retry(
     if config is None:
         config = RetryConfig()
 
+    if config.max_retries == 0 and circuit_breaker is None and controller is None:
+        # Nothing to retry, guard or report: return the function unwrapped
+        def passthrough(
+            func: Callable[P, Coroutine[Any, Any, R]],
+        ) -> Callable[P, Coroutine[Any, Any, R]]:
+            return func
+
+        return passthrough
+
+    # Config is fixed per decorator site, so precompute the capped backoff for
+    # each attempt; only the jitter is rolled when a retry actually happens.
+    max_retries = config.max_retries
+    base_delays = [
+        min(config.base_delay * (config.exponential_base**attempt), config.max_delay)
+        for attempt in range(max_retries)
+    ]
+
     def decorator(
         func: Callable[P, Coroutine[Any, Any, R]],
     ) -> Callable[P, Coroutine[Any, Any, R]]:
         @functools.wraps(func)
         async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            # Check circuit breaker using async-safe method
-            if circuit_breaker and await circuit_breaker.async_is_open():
+            # Check circuit breaker; reserves the single probe slot when HALF_OPEN
+            admission = circuit_breaker.try_acquire() if circuit_breaker else Admission.ADMITTED
+            if circuit_breaker and not admission:
                 raise CircuitOpenError(f"Circuit breaker {circuit_breaker.name} is open")
 
             last_exception: Exception | None = None
+            prev_delay = config.base_delay
+            attempts_allowed = (
+                max_retries if controller is None or controller.allow_retries() else 0
+            )
 
-            for attempt in range(config.max_retries + 1):
-                try:
-                    result = await func(*args, **kwargs)
-                    if circuit_breaker:
-                        await circuit_breaker.async_record_success()
-                    return result
-
-                except config.retry_exceptions as e:
-                    last_exception = e
-
-                    if circuit_breaker:
-                        await circuit_breaker.async_record_failure()
-
-                    if attempt < config.max_retries:
-                        delay = calculate_delay(attempt, config)
-                        logger.warning(
-                            f"Retry {attempt + 1}/{config.max_retries} for "
-                            f"{func.__name__}: {e}. Waiting {delay:.1f}s"
-                        )
-                        await asyncio.sleep(delay)
-                    else:
-                        logger.error(
-                            f"All {config.max_retries} retries exhausted for {func.__name__}: {e}"
-                        )
+            try:
+                for attempt in range(attempts_allowed + 1):
+                    try:
+                        result = await func(*args, **kwargs)
+                        if circuit_breaker:
+                            circuit_breaker.record_success()
+                        if controller:
+                            controller.record(True)
+                        return result
+
+                    except config.retry_exceptions as e:
+                        last_exception = e
+
+                        if controller:
+                            controller.record(False)
+
+                        if circuit_breaker:
+                            circuit_breaker.record_failure()
+                            if circuit_breaker.state == "OPEN":
+                                # Don't keep hammering a service we just tripped on
+                                logger.error(
+                                    f"Circuit breaker {circuit_breaker.name} opened, "
+                                    f"not retrying {func.__name__}: {e}"
+                                )
+                                break
+
+                        if attempt < attempts_allowed:
+                            delay = _jittered_delay(base_delays[attempt], prev_delay, config)
+                            prev_delay = delay
+                            logger.warning(
+                                f"Retry {attempt + 1}/{max_retries} for "
+                                f"{func.__name__}: {e}. Waiting {delay:.1f}s"
+                            )
+                            await asyncio.sleep(delay)
+                        elif attempts_allowed < max_retries:
+                            logger.error(
+                                f"Retries suppressed during failure storm for {func.__name__}: {e}"
+                            )
+                        else:
+                            logger.error(
+                                f"All {max_retries} retries exhausted for {func.__name__}: {e}"
+                            )
+            finally:
+                if admission is Admission.PROBE and circuit_breaker:
+                    circuit_breaker.release()
 
             if last_exception:
                 raise last_exception
@@ -215,3 +451,6 @@ vision_circuit = CircuitBreaker(
     recovery_timeout=60.0,
     name="vision_api",
 )
+
+# Shared retry controller for vision API calls
+vision_controller = RetryController(name="vision_api")
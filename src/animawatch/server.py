@@ -8,55 +8,186 @@ Built with FastMCP leveraging the latest MCP spec (2025-11-25):
 - Sampling for server-side LLM requests
 """
 
+import argparse
+import asyncio
 import contextlib
-import uuid
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+import functools
+import hashlib
+import itertools
+import json
+import tempfile
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 from mcp.server.fastmcp import Context, FastMCP
 from mcp.server.fastmcp.utilities.types import Image
 from mcp.server.session import ServerSession
+from pydantic_core import to_jsonable_python
 
-from .browser import BrowserRecorder
+from .cache import AnalysisCache, LRUDict
 from .config import settings
-from .consensus import analyze_with_consensus as run_consensus_analysis
 from .devices import DEVICES, DeviceCategory, get_device
 from .diff import compare_images
 from .fps import analyze_video_fps, generate_fps_report
+from .logging import log_extra
 from .metrics import extract_performance_metrics, generate_metrics_report
-from .vision import VisionProvider, get_vision_provider
+from .models import Action
+
+# Playwright and the vision SDKs are slow to import, so they load in
+# app_lifespan (or the tool that needs them) rather than at module import
+if TYPE_CHECKING:
+    from .browser import BrowserRecorder
+    from .vision import VisionProvider
 
 # =============================================================================
 # Application Context (Lifespan Management)
 # =============================================================================
 
 
+# Parent of the animawatch-* temp dirs BrowserRecorder records into
+_TEMP_DIR = Path(tempfile.gettempdir())
+
+# Result IDs only need to be unique within this process (storage is in-memory),
+# so a counter replaces a random UUID draw per tool call
+_id_counter = itertools.count(1)
+
+
+def _next_id() -> str:
+    """Return the next result ID as 8 zero-padded hex digits."""
+    return format(next(_id_counter), "08x")
+
+
+def _discard_recording(_recording_id: str, path: Path) -> None:
+    """Delete an evicted recording if it lives in a temp dir we created.
+
+    Recordings saved to a caller-chosen output_dir are left on disk.
+    """
+    if path.parent.name.startswith("animawatch-") and path.parent.parent == _TEMP_DIR:
+        path.unlink(missing_ok=True)
+        with contextlib.suppress(OSError):
+            path.parent.rmdir()
+
+
+async def _remove_file(path: Path) -> None:
+    """Delete a temporary capture without blocking the event loop."""
+    with contextlib.suppress(OSError):
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+
+
+# The event loop holds only weak references to tasks, so keep fire-and-forget
+# cleanup tasks alive here until they finish
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+def _remove_file_later(path: Path) -> None:
+    """Delete a temporary capture in the background so the response isn't delayed."""
+    task = asyncio.create_task(_remove_file(path))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _recording_store() -> dict[str, Path]:
+    return LRUDict(settings.max_stored_recordings, on_evict=_discard_recording)
+
+
+def _analysis_store() -> dict[str, str]:
+    return LRUDict(settings.max_stored_analyses)
+
+
+def _tool_cache() -> AnalysisCache:
+    return AnalysisCache(default_ttl=settings.tool_cache_ttl, max_size=256)
+
+
+def _tool_cache_key(tool: str, *args: Any) -> str:
+    """Build a cache key from a tool name and the arguments that shape its output."""
+    payload = json.dumps([tool, *args], sort_keys=True, default=to_jsonable_python)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
 @dataclass
 class AppContext:
-    """Type-safe application context for dependency injection."""
+    """Type-safe application context for dependency injection.
+
+    Recordings and analyses are bounded LRU stores so a long-running server
+    doesn't grow without limit. tool_cache reuses recent analyses for
+    identical URL-based tool calls, and inflight lets concurrent identical
+    calls share one run.
+    """
+
+    browser: "BrowserRecorder"
+    vision: "VisionProvider"
+    recordings: dict[str, Path] = field(default_factory=_recording_store)
+    analyses: dict[str, str] = field(default_factory=_analysis_store)
+    tool_cache: AnalysisCache = field(default_factory=_tool_cache)
+    inflight: dict[str, asyncio.Task[str]] = field(default_factory=dict)
+    config_text: str = ""
+
+
+async def _coalesced(
+    app_ctx: AppContext, key: str, work: Callable[[], Coroutine[Any, Any, str]]
+) -> str:
+    """Run work once for all concurrent callers with the same key."""
+    task = app_ctx.inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(work())
+        app_ctx.inflight[key] = task
+
+        def finished(done: asyncio.Task[str]) -> None:
+            app_ctx.inflight.pop(key, None)
+            # Retrieve the error so it is recorded even if every waiter was cancelled
+            if not done.cancelled() and (error := done.exception()) is not None:
+                log_extra("Coalesced tool run failed", key=key, error=str(error))
+
+        task.add_done_callback(finished)
+    # Shield so one caller disconnecting doesn't cancel the work for the others
+    return await asyncio.shield(task)
+
+
+async def _stream_analysis(
+    ctx: Context[ServerSession, AppContext], chunks: AsyncIterator[str]
+) -> str:
+    """Collect a streamed analysis, forwarding each chunk as a progress message.
 
-    browser: BrowserRecorder
-    vision: VisionProvider
-    recordings: dict[str, Path] = field(default_factory=dict)
-    analyses: dict[str, str] = field(default_factory=dict)
+    Clients that sent a progress token see the analysis as it is generated;
+    for everyone else report_progress is a no-op and only the result matters.
+    """
+    parts: list[str] = []
+    async for chunk in chunks:
+        parts.append(chunk)
+        await ctx.report_progress(len(parts), message=chunk)
+    return "".join(parts)
+
+
+def _render_config() -> str:
+    """Render the animawatch://config resource body from settings."""
+    return f"""AnimaWatch Configuration:
+- Vision Provider: {settings.vision_provider}
+- Vision Model: {settings.vision_model}
+- Browser Headless: {settings.browser_headless}
+- Video Size: {settings.video_width}x{settings.video_height}
+- Max Recording Duration: {settings.max_recording_duration}s"""
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     """Manage application lifecycle with proper resource cleanup."""
-    # Startup: Initialize browser and vision provider
-    browser = BrowserRecorder()
-    await browser.start()
-    vision = get_vision_provider()
+    # Resources are closed in reverse order on shutdown, including when a
+    # later startup step fails
+    from .browser import BrowserRecorder
+    from .vision import get_vision_provider
 
-    try:
-        yield AppContext(browser=browser, vision=vision)
-    finally:
-        # Shutdown: Clean up browser
-        await browser.stop()
+    async with AsyncExitStack() as stack:
+        browser = await stack.enter_async_context(BrowserRecorder())
+        # Pay context setup at startup rather than on the first screenshot
+        await browser.prewarm()
+        vision = await stack.enter_async_context(get_vision_provider())
+
+        # Settings are fixed for the server's lifetime, so render the config
+        # resource once rather than on every read
+        yield AppContext(browser=browser, vision=vision, config_text=_render_config())
 
 
 # =============================================================================
@@ -137,19 +268,7 @@ For EACH issue found, report:
 If no issues are found, confirm the animations are smooth and well-implemented."""
 
 
-@mcp.prompt()
-def animation_diagnosis(focus_area: str = "all") -> str:
-    """Generate prompt for animation analysis with optional focus area."""
-    base = ANIMATION_PROMPT
-    if focus_area != "all":
-        return f"{base}\n\n**FOCUS SPECIFICALLY ON**: {focus_area}"
-    return base
-
-
-@mcp.prompt()
-def page_analysis(aspects: str = "layout, colors, typography, spacing") -> str:
-    """Generate prompt for static page visual analysis."""
-    return f"""You are an expert UI/UX designer reviewing a webpage screenshot.
+_PAGE_PROMPT_TEMPLATE = """You are an expert UI/UX designer reviewing a webpage screenshot.
 
 Analyze the following aspects: {aspects}
 
@@ -161,11 +280,7 @@ For each issue found:
 
 Also note what's done well."""
 
-
-@mcp.prompt()
-def accessibility_check() -> str:
-    """Generate prompt for accessibility-focused analysis."""
-    return """You are an accessibility expert reviewing a webpage.
+_ACCESSIBILITY_PROMPT = """You are an accessibility expert reviewing a webpage.
 
 Check for:
 - Color contrast issues
@@ -178,18 +293,52 @@ Check for:
 Rate overall accessibility and provide specific recommendations."""
 
 
+# Prompts are rebuilt on every tool call, but focus/aspects take only a
+# handful of distinct values in practice, so memoize the formatted strings
+@functools.lru_cache(maxsize=64)
+def _focused_animation_prompt(focus_area: str) -> str:
+    return f"{ANIMATION_PROMPT}\n\n**FOCUS SPECIFICALLY ON**: {focus_area}"
+
+
+@functools.lru_cache(maxsize=64)
+def _page_prompt(aspects: str) -> str:
+    return _PAGE_PROMPT_TEMPLATE.format(aspects=aspects)
+
+
+@mcp.prompt()
+def animation_diagnosis(focus_area: str = "all") -> str:
+    """Generate prompt for animation analysis with optional focus area."""
+    # The default needs no formatting, so keep it out of the cache entirely
+    if focus_area == "all":
+        return ANIMATION_PROMPT
+    return _focused_animation_prompt(focus_area)
+
+
+@mcp.prompt()
+def page_analysis(aspects: str = "layout, colors, typography, spacing") -> str:
+    """Generate prompt for static page visual analysis."""
+    return _page_prompt(aspects)
+
+
+@mcp.prompt()
+def accessibility_check() -> str:
+    """Generate prompt for accessibility-focused analysis."""
+    return _ACCESSIBILITY_PROMPT
+
+
 # =============================================================================
 # Resources (MCP Resources Feature)
 # =============================================================================
 
 
 @mcp.resource("animawatch://recordings/{recording_id}")
-def get_recording(recording_id: str, ctx: Context[ServerSession, AppContext]) -> str:
+async def get_recording(recording_id: str, ctx: Context[ServerSession, AppContext]) -> str:
     """Get information about a stored recording."""
     app_ctx = ctx.request_context.lifespan_context
     if recording_id in app_ctx.recordings:
         path = app_ctx.recordings[recording_id]
-        return f"Recording: {recording_id}\nPath: {path}\nExists: {path.exists()}"
+        exists = await asyncio.to_thread(path.exists)
+        return f"Recording: {recording_id}\nPath: {path}\nExists: {exists}"
     return f"Recording not found: {recording_id}"
 
 
@@ -205,12 +354,8 @@ def get_analysis(analysis_id: str, ctx: Context[ServerSession, AppContext]) -> s
 @mcp.resource("animawatch://config")
 def get_config() -> str:
     """Get current AnimaWatch configuration."""
-    return f"""AnimaWatch Configuration:
-- Vision Provider: {settings.vision_provider}
-- Vision Model: {settings.vision_model}
-- Browser Headless: {settings.browser_headless}
-- Video Size: {settings.video_width}x{settings.video_height}
-- Max Recording Duration: {settings.max_recording_duration}s"""
+    ctx: Context[ServerSession, AppContext] = mcp.get_context()
+    return ctx.request_context.lifespan_context.config_text
 
 
 # =============================================================================
@@ -221,11 +366,13 @@ def get_config() -> str:
 @mcp.tool()
 async def watch(
     url: str,
-    actions: list[dict[str, Any]] | None = None,
+    actions: list[Action] | None = None,
     wait_time: float = 3.0,
     focus: str = "all",
     save_recording: bool = False,
-    ctx: Context[ServerSession, AppContext] | None = None,
+    force_refresh: bool = False,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Watch a web page and analyze animations for issues.
 
@@ -238,47 +385,65 @@ async def watch(
         wait_time: Seconds to wait after actions for animations to complete
         focus: Focus area for analysis (e.g., "modal animations", "scroll behavior")
         save_recording: Whether to save the recording for later access via resources
+        force_refresh: Re-record even if an identical request was analyzed recently
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
     vision = app_ctx.vision
 
-    # Record the interaction
-    video_path = await browser.record_interaction(
-        url=url,
-        actions=actions,
-        wait_time=wait_time,
-    )
-
-    # Generate analysis prompt
-    prompt = animation_diagnosis(focus)
-
-    # Analyze with vision AI (non-structured for backward compatibility)
-    analysis_result = await vision.analyze_video(video_path, prompt, structured=False)
-    # Handle both string and AnalysisResult return types
-    analysis = (
-        analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
-    )
-
-    # Store results if requested
-    result_id = str(uuid.uuid4())[:8]
+    cache_key = _tool_cache_key("watch", url, actions, wait_time, focus)
+
+    async def record_and_analyze() -> tuple[Path, str]:
+        # Record the interaction
+        video_path = await browser.record_interaction(
+            url=url,
+            actions=actions,
+            wait_time=wait_time,
+        )
+
+        # Generate analysis prompt
+        prompt = animation_diagnosis(focus)
+
+        # Analyze with vision AI (non-structured for backward compatibility)
+        analysis_result = await vision.analyze_video(video_path, prompt, structured=False)
+        # Handle both string and AnalysisResult return types
+        analysis = (
+            analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
+        )
+        await app_ctx.tool_cache.set(cache_key, analysis)
+        return video_path, analysis
+
+    async def analyze_and_discard() -> str:
+        video_path, analysis = await record_and_analyze()
+        _remove_file_later(video_path)
+        return analysis
+
+    result_id = _next_id()
     if save_recording:
+        # A saved recording needs its own fresh video
+        video_path, analysis = await record_and_analyze()
         app_ctx.recordings[result_id] = video_path
     else:
-        with contextlib.suppress(OSError):
-            video_path.unlink()
+        # Identical requests within the TTL reuse the last analysis, and
+        # concurrent identical requests share one recording
+        cached = None if force_refresh else await app_ctx.tool_cache.get(cache_key)
+        if cached is not None:
+            analysis = cached
+        else:
+            analysis = await _coalesced(app_ctx, cache_key, analyze_and_discard)
 
     app_ctx.analyses[result_id] = analysis
 
-    output = f"## 🎬 Animation Analysis for {url}\n\n"
-    output += f"**Analysis ID**: `{result_id}` (access via `animawatch://analyses/{result_id}`)\n\n"
-    if save_recording:
-        output += f"**Recording ID**: `{result_id}` (access via `animawatch://recordings/{result_id}`)\n\n"
-    output += analysis
-
-    return output
+    recording_line = (
+        f"**Recording ID**: `{result_id}` (access via `animawatch://recordings/{result_id}`)\n\n"
+        if save_recording
+        else ""
+    )
+    return (
+        f"## 🎬 Animation Analysis for {url}\n\n"
+        f"**Analysis ID**: `{result_id}` (access via `animawatch://analyses/{result_id}`)\n\n"
+        f"{recording_line}{analysis}"
+    )
 
 
 @mcp.tool()
@@ -286,7 +451,8 @@ async def screenshot(
     url: str,
     full_page: bool = True,
     focus: str = "layout, colors, typography, spacing",
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> Image:
     """Take a screenshot and return it with analysis.
 
@@ -297,32 +463,22 @@ async def screenshot(
         full_page: Capture full scrollable page or just viewport
         focus: Aspects to focus analysis on
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
     vision = app_ctx.vision
 
-    screenshot_path = await browser.take_screenshot(url, full_page)
+    # Keep the PNG in memory: it is both analyzed and returned, so a temp
+    # file would only add a write, a read back and an unlink
+    image_data = await browser.take_screenshot_bytes(url, full_page, use_pool=True)
 
-    # Analyze with vision AI
+    # Analyze with vision AI, streaming partial text to the client as it arrives
     prompt = page_analysis(focus)
-    analysis_result = await vision.analyze_image(screenshot_path, prompt, structured=False)
-    analysis = (
-        analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
-    )
+    analysis = await _stream_analysis(ctx, vision.analyze_image_streaming(image_data, prompt))
 
     # Store analysis
-    result_id = str(uuid.uuid4())[:8]
+    result_id = _next_id()
     app_ctx.analyses[result_id] = f"Screenshot analysis of {url}:\n\n{analysis}"
 
-    # Read image data for return
-    with open(screenshot_path, "rb") as f:
-        image_data = f.read()
-
-    with contextlib.suppress(OSError):
-        screenshot_path.unlink()
-
     return Image(data=image_data, format="png")
 
 
@@ -330,7 +486,8 @@ async def screenshot(
 async def analyze_video(
     video_path: str,
     focus: str = "all",
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Analyze an existing video file for animation issues.
 
@@ -338,13 +495,11 @@ async def analyze_video(
         video_path: Path to the video file
         focus: Focus area for analysis
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
     app_ctx = ctx.request_context.lifespan_context
     vision = app_ctx.vision
 
     path = Path(video_path)
-    if not path.exists():
+    if not await asyncio.to_thread(path.exists):
         return f"❌ Video not found: {video_path}"
 
     prompt = animation_diagnosis(focus)
@@ -353,7 +508,7 @@ async def analyze_video(
         analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
     )
 
-    result_id = str(uuid.uuid4())[:8]
+    result_id = _next_id()
     app_ctx.analyses[result_id] = analysis
 
     return f"## 🎥 Video Analysis\n\n**Analysis ID**: `{result_id}`\n\n{analysis}"
@@ -362,10 +517,11 @@ async def analyze_video(
 @mcp.tool()
 async def record(
     url: str,
-    actions: list[dict[str, Any]] | None = None,
+    actions: list[Action] | None = None,
     wait_time: float = 3.0,
     output_dir: str | None = None,
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Record a browser interaction without analysis.
 
@@ -377,8 +533,6 @@ async def record(
         wait_time: Seconds to wait after actions
         output_dir: Directory to save video (default: temp directory)
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
 
@@ -390,7 +544,7 @@ async def record(
         video_dir=video_dir,
     )
 
-    result_id = str(uuid.uuid4())[:8]
+    result_id = _next_id()
     app_ctx.recordings[result_id] = video_path
 
     return f"""## 🎥 Recording Complete
@@ -405,7 +559,9 @@ Analyze with: `analyze_video("{video_path}")`"""
 @mcp.tool()
 async def check_accessibility(
     url: str,
-    ctx: Context[ServerSession, AppContext] | None = None,
+    force_refresh: bool = False,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Check a page for visual accessibility issues.
 
@@ -413,25 +569,32 @@ async def check_accessibility(
 
     Args:
         url: URL to check
+        force_refresh: Re-capture even if this URL was checked recently
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
     vision = app_ctx.vision
 
-    screenshot_path = await browser.take_screenshot(url, full_page=True)
+    cache_key = _tool_cache_key("check_accessibility", url)
 
-    prompt = accessibility_check()
-    analysis_result = await vision.analyze_image(screenshot_path, prompt, structured=False)
-    analysis = (
-        analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
-    )
+    async def capture_and_analyze() -> str:
+        # The capture is only analyzed, never returned, so keep it in memory
+        image_data = await browser.take_screenshot_bytes(url, full_page=True, use_pool=True)
 
-    with contextlib.suppress(OSError):
-        screenshot_path.unlink()
+        # This runs in the task shared by coalesced callers, so it must not
+        # report through any one caller's ctx; it just collects the stream
+        prompt = accessibility_check()
+        analysis = "".join(
+            [chunk async for chunk in vision.analyze_image_streaming(image_data, prompt)]
+        )
+        await app_ctx.tool_cache.set(cache_key, analysis)
+        return analysis
 
-    result_id = str(uuid.uuid4())[:8]
+    analysis = None if force_refresh else await app_ctx.tool_cache.get(cache_key)
+    if analysis is None:
+        analysis = await _coalesced(app_ctx, cache_key, capture_and_analyze)
+
+    result_id = _next_id()
     app_ctx.analyses[result_id] = analysis
 
     return f"## ♿ Accessibility Analysis for {url}\n\n**Analysis ID**: `{result_id}`\n\n{analysis}"
@@ -442,20 +605,8 @@ async def check_accessibility(
 # =============================================================================
 
 
-@mcp.tool()
-async def list_devices(category: str | None = None) -> str:
-    """List available device profiles for emulation.
-
-    Args:
-        category: Filter by category: "mobile", "tablet", or "desktop" (default: all)
-    """
-    cat = None
-    if category:
-        try:
-            cat = DeviceCategory(category.lower())
-        except ValueError:
-            return f"❌ Invalid category '{category}'. Use: mobile, tablet, or desktop"
-
+def _format_device_listing(cat: DeviceCategory | None) -> str:
+    """Render the list_devices output for one category (or all devices)."""
     lines = ["## 📱 Available Device Profiles\n"]
     if cat:
         lines.append(f"**Category**: {cat.value}\n")
@@ -472,14 +623,38 @@ async def list_devices(category: str | None = None) -> str:
     return "\n".join(lines)
 
 
+# The device catalog is static, so render every listing once at import
+_DEVICE_LISTINGS: dict[DeviceCategory | None, str] = {
+    cat: _format_device_listing(cat) for cat in (None, *DeviceCategory)
+}
+
+
+@mcp.tool()
+async def list_devices(category: str | None = None) -> str:
+    """List available device profiles for emulation.
+
+    Args:
+        category: Filter by category: "mobile", "tablet", or "desktop" (default: all)
+    """
+    cat = None
+    if category:
+        try:
+            cat = DeviceCategory(category.lower())
+        except ValueError:
+            return f"❌ Invalid category '{category}'. Use: mobile, tablet, or desktop"
+
+    return _DEVICE_LISTINGS[cat]
+
+
 @mcp.tool()
 async def watch_with_device(
     url: str,
     device: str,
-    actions: list[dict[str, Any]] | None = None,
+    actions: list[Action] | None = None,
     wait_time: float = 3.0,
     focus: str = "all",
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Watch a web page with device emulation.
 
@@ -493,8 +668,6 @@ async def watch_with_device(
         wait_time: Seconds to wait after actions
         focus: Focus area for analysis
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
 
     profile = get_device(device)
     if profile is None:
@@ -519,17 +692,18 @@ async def watch_with_device(
         analysis_result if isinstance(analysis_result, str) else analysis_result.to_markdown()
     )
 
-    result_id = str(uuid.uuid4())[:8]
+    result_id = _next_id()
     app_ctx.analyses[result_id] = analysis
 
-    with contextlib.suppress(OSError):
-        video_path.unlink()
+    _remove_file_later(video_path)
 
-    output = "## 📱 Device Animation Analysis\n\n"
-    output += f"**Device**: {profile.name} ({profile.width}x{profile.height})\n"
-    output += f"**URL**: {url}\n"
-    output += f"**Analysis ID**: `{result_id}`\n\n"
-    output += analysis
+    output = (
+        "## 📱 Device Animation Analysis\n\n"
+        f"**Device**: {profile.name} ({profile.width}x{profile.height})\n"
+        f"**URL**: {url}\n"
+        f"**Analysis ID**: `{result_id}`\n\n"
+        f"{analysis}"
+    )
 
     return output
 
@@ -539,7 +713,8 @@ async def compare_screenshots(
     url1: str,
     url2: str,
     threshold: int = 10,
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Compare screenshots of two pages/states for visual differences.
 
@@ -551,47 +726,47 @@ async def compare_screenshots(
         url2: Second URL (after)
         threshold: Pixel difference threshold (0-255, default 10)
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
 
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
 
-    # Take screenshots of both
-    screenshot1 = await browser.take_screenshot(url1, full_page=True)
-    screenshot2 = await browser.take_screenshot(url2, full_page=True)
+    # Take both screenshots concurrently (each uses its own browser context)
+    screenshot1, screenshot2 = await asyncio.gather(
+        browser.take_screenshot(url1, full_page=True, use_pool=True),
+        browser.take_screenshot(url2, full_page=True, use_pool=True),
+    )
 
     # Compare images
     result = compare_images(screenshot1, screenshot2, threshold=threshold, output_diff=True)
 
     # Clean up screenshots
-    with contextlib.suppress(OSError):
-        screenshot1.unlink()
-        screenshot2.unlink()
+    _remove_file_later(screenshot1)
+    _remove_file_later(screenshot2)
 
     # Format output
-    output = "## 🔍 Visual Diff Comparison\n\n"
-    output += f"**Before**: {url1}\n"
-    output += f"**After**: {url2}\n\n"
+    parts = [f"## 🔍 Visual Diff Comparison\n\n**Before**: {url1}\n**After**: {url2}\n\n"]
 
     if result.has_differences:
-        output += "⚠️ **Differences detected!**\n\n"
-        output += f"- **Similarity**: {result.overall_similarity:.1f}%\n"
-        output += f"- **Diff Percentage**: {result.diff_percentage:.2f}%\n"
-        output += f"- **Diff Regions**: {len(result.diff_regions)}\n\n"
-
-        for i, region in enumerate(result.diff_regions, 1):
-            output += f"**Region {i}**: "
-            output += f"({region.x}, {region.y}) {region.width}x{region.height} "
-            output += f"({region.difference_score:.1f}% different)\n"
+        parts.append(
+            "⚠️ **Differences detected!**\n\n"
+            f"- **Similarity**: {result.overall_similarity:.1f}%\n"
+            f"- **Diff Percentage**: {result.diff_percentage:.2f}%\n"
+            f"- **Diff Regions**: {len(result.diff_regions)}\n\n"
+        )
+        parts.extend(
+            f"**Region {i}**: ({region.x}, {region.y}) {region.width}x{region.height} "
+            f"({region.difference_score:.1f}% different)\n"
+            for i, region in enumerate(result.diff_regions, 1)
+        )
 
         if result.diff_image_path:
-            output += f"\n📸 Diff image saved: `{result.diff_image_path}`"
+            parts.append(f"\n📸 Diff image saved: `{result.diff_image_path}`")
     else:
-        output += "✅ **No visual differences detected!**\n"
-        output += f"Similarity: {result.overall_similarity:.1f}%"
+        parts.append(
+            f"✅ **No visual differences detected!**\nSimilarity: {result.overall_similarity:.1f}%"
+        )
 
-    return output
+    return "".join(parts)
 
 
 @mcp.tool()
@@ -611,7 +786,7 @@ async def analyze_fps(
         jank_threshold_ms: Frame time deviation threshold for jank (default 5ms)
     """
     path = Path(video_path)
-    if not path.exists():
+    if not await asyncio.to_thread(path.exists):
         return f"❌ Video not found: {video_path}"
 
     result = await analyze_video_fps(path, target_fps, jank_threshold_ms)
@@ -623,7 +798,8 @@ async def analyze_fps(
 @mcp.tool()
 async def get_performance_metrics(
     url: str,
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Get Core Web Vitals and performance metrics for a page.
 
@@ -632,8 +808,6 @@ async def get_performance_metrics(
     Args:
         url: URL to analyze
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
 
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
@@ -645,7 +819,7 @@ async def get_performance_metrics(
         metrics = await extract_performance_metrics(page, url)
         report = generate_metrics_report(metrics)
 
-    result_id = str(uuid.uuid4())[:8]
+    result_id = _next_id()
     app_ctx.analyses[result_id] = report
 
     return f"**Analysis ID**: `{result_id}`\n\n{report}"
@@ -655,7 +829,8 @@ async def get_performance_metrics(
 async def analyze_with_consensus_tool(
     url: str,
     focus: str = "all",
-    ctx: Context[ServerSession, AppContext] | None = None,
+    *,
+    ctx: Context[ServerSession, AppContext],
 ) -> str:
     """Analyze a page using multiple AI models for higher accuracy.
 
@@ -666,50 +841,58 @@ async def analyze_with_consensus_tool(
         url: URL to analyze
         focus: Focus area for analysis
     """
-    if ctx is None:
-        raise RuntimeError("Context is required")
 
     app_ctx = ctx.request_context.lifespan_context
     browser = app_ctx.browser
 
-    # Take screenshot for analysis
-    screenshot_path = await browser.take_screenshot(url, full_page=True)
-
+    # Start the capture, then build the prompt while the page loads
+    shot_task = asyncio.create_task(
+        browser.take_screenshot_bytes(url, full_page=True, use_pool=True)
+    )
     prompt = animation_diagnosis(focus)
+    image_data = await shot_task
 
-    # Run consensus analysis
-    result = await run_consensus_analysis(screenshot_path, prompt)
+    # Run consensus analysis (Gemini and Ollama are queried concurrently)
+    from .consensus import analyze_with_consensus
 
-    with contextlib.suppress(OSError):
-        screenshot_path.unlink()
+    result = await analyze_with_consensus(image_data, prompt)
 
     # Format output
-    output = "## 🤝 Multi-Model Consensus Analysis\n\n"
-    output += f"**URL**: {url}\n"
-    output += f"**Consensus Score**: {result.consensus_score:.0f}%\n\n"
+    parts = [
+        "## 🤝 Multi-Model Consensus Analysis\n\n"
+        f"**URL**: {url}\n"
+        f"**Consensus Score**: {result.consensus_score:.0f}%\n\n"
+    ]
 
     if result.agreed_findings:
-        output += "### ✅ Agreed Issues (High Confidence)\n\n"
+        parts.append("### ✅ Agreed Issues (High Confidence)\n\n")
         for finding in result.agreed_findings:
-            output += f"- **{finding.severity.value}** [{finding.category.value}]: "
-            output += f"{finding.description}\n"
-            if finding.suggestion:
-                output += f"  - 💡 {finding.suggestion}\n"
+            suggestion = f"  - 💡 {finding.suggestion}\n" if finding.suggestion else ""
+            parts.append(
+                f"- **{finding.severity.value}** [{finding.category.value}]: "
+                f"{finding.description}\n{suggestion}"
+            )
 
     if result.gemini_only:
-        output += "\n### 🔵 Gemini-Only Findings\n\n"
-        for finding in result.gemini_only:
-            output += f"- **{finding.severity.value}**: {finding.description}\n"
+        parts.append("\n### 🔵 Gemini-Only Findings\n\n")
+        parts.extend(
+            f"- **{finding.severity.value}**: {finding.description}\n"
+            for finding in result.gemini_only
+        )
 
     if result.ollama_only:
-        output += "\n### 🟢 Ollama-Only Findings\n\n"
-        for finding in result.ollama_only:
-            output += f"- **{finding.severity.value}**: {finding.description}\n"
+        parts.append("\n### 🟢 Ollama-Only Findings\n\n")
+        parts.extend(
+            f"- **{finding.severity.value}**: {finding.description}\n"
+            for finding in result.ollama_only
+        )
 
     if not result.merged_findings:
-        output += "No issues found by either model. ✨"
+        parts.append("No issues found by either model. ✨")
 
-    result_id = str(uuid.uuid4())[:8]
+    output = "".join(parts)
+
+    result_id = _next_id()
     app_ctx.analyses[result_id] = output
 
     return output
@@ -720,14 +903,26 @@ async def analyze_with_consensus_tool(
 # =============================================================================
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """Run the AnimaWatch MCP server."""
-    import sys
+    parser = argparse.ArgumentParser(prog="animawatch", description="AnimaWatch MCP server")
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Serve over streamable HTTP instead of stdio",
+    )
+    args = parser.parse_args(argv)
 
     # Support both stdio (default) and streamable-http transports
-    transport: Literal["stdio", "streamable-http"] = "stdio"
-    if "--http" in sys.argv:
-        transport = "streamable-http"
+    transport: Literal["stdio", "streamable-http"] = "streamable-http" if args.http else "stdio"
+
+    # Use uvloop when the optional "fast" extra is installed
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
     mcp.run(transport=transport)
 
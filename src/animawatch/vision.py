@@ -12,28 +12,51 @@ Includes:
 import asyncio
 import base64
 import contextlib
-import json
-import mimetypes
+import functools
+import re
 import time
 import uuid
+import weakref
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from pathlib import Path
 from typing import Any, TypedDict
 
-import aiofiles
+import httpx
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from pydantic import BaseModel, Field
 
-from .cache import AnalysisCache, analysis_cache
+from .cache import AnalysisCache, LRUDict, analysis_cache
 from .config import settings
 from .logging import log_extra, timed_operation
 from .models import AnalysisMetadata, AnalysisResult, Finding, IssueCategory, Severity
-from .retry import RetryConfig, vision_circuit, with_retry
+from .retry import (
+    Admission,
+    CircuitOpenError,
+    RetryConfig,
+    vision_circuit,
+    vision_controller,
+    with_retry,
+)
+
+# Pending upload deletions, referenced here so they aren't garbage-collected
+_background_tasks: set[asyncio.Task[None]] = set()
+
+# Body of a markdown code fence wrapping a model response, e.g. ```json ... ```
+_FENCE_RE = re.compile(r"^```[^\n]*\n(.*?)\n?```", re.DOTALL)
+
+# Recordings are always WebM; naming the type skips the SDK's suffix lookup
+_VIDEO_UPLOAD_CONFIG = types.UploadFileConfig(mime_type="video/webm")
 
 # Maximum time to wait for video processing (5 minutes)
 MAX_PROCESSING_SECONDS = 300
 
+# Processing-state polls back off from 100 ms so short clips are picked up
+# quickly and long ones don't hammer files.get
+PROCESSING_POLL_INITIAL_SECONDS = 0.1
+PROCESSING_POLL_MAX_SECONDS = 2.0
+
 # Retry configuration for vision API calls
 VISION_RETRY_CONFIG = RetryConfig(
     max_retries=3,
@@ -67,6 +90,10 @@ IMPORTANT: Respond with a valid JSON object following this exact structure:
 
 Only return the JSON object, no markdown formatting or additional text."""
 
+# Gemini takes the instruction as its own part, so it is built once and
+# structured requests never copy it onto the end of each prompt
+_JSON_INSTRUCTION_PART = types.Part.from_text(text=JSON_OUTPUT_INSTRUCTION)
+
 
 # TypedDict for Ollama API response to avoid Any type leaks
 class OllamaMessage(TypedDict):
@@ -81,11 +108,91 @@ class OllamaResponse(TypedDict):
     message: OllamaMessage
 
 
+# Image formats the vision models accept; anything else is sent as PNG.
+# A fixed table avoids loading the system MIME database on first use.
+_IMAGE_MIME_TYPES: dict[str, str] = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".heic": "image/heic",
+    ".heif": "image/heif",
+}
+
+
+# Providers are built per consensus call, so share one client (and its
+# connection pool) per API key or host instead of reconnecting each time
+@functools.lru_cache(maxsize=4)
+def _genai_client(api_key: str) -> genai.Client:
+    return genai.Client(api_key=api_key)
+
+
+@functools.lru_cache(maxsize=4)
+def _ollama_client(host: str) -> Any:
+    import ollama
+
+    return ollama.AsyncClient(host=host)
+
+
+def _short_id() -> str:
+    """Random 8-character id for findings and analysis results."""
+    return uuid.uuid4().hex[:8]
+
+
+class _ModelFinding(Finding):
+    """A finding as the model writes it, with defaults for omitted fields.
+
+    Subclassing Finding lets the reply validate straight into findings in
+    one pass; AnalysisResult accepts the instances without re-validating.
+    """
+
+    id: str = Field(default_factory=_short_id)
+    category: IssueCategory = IssueCategory.VISUAL_ARTIFACT
+    severity: Severity = Severity.MINOR
+    confidence: int = Field(default=50, ge=0, le=100)
+    element: str = "Unknown element"
+    description: str = ""
+    suggestion: str = ""
+
+
+class _ModelResponse(BaseModel):
+    """Top-level JSON object requested by JSON_OUTPUT_INSTRUCTION."""
+
+    findings: list[_ModelFinding] | None = None
+    summary: str = "Analysis complete"
+    overall_score: int | None = None
+
+
+def _image_label(image: Path | bytes) -> str:
+    """Describe an image argument for logs without dumping raw bytes."""
+    return f"<{len(image)} bytes>" if isinstance(image, bytes) else str(image)
+
+
 class VisionProvider(ABC):
     """Abstract base class for vision AI providers."""
 
     def __init__(self) -> None:
         self._cache: AnalysisCache = analysis_cache
+        # (path, mtime_ns, size, prompt, structured, model) -> cache key, so an
+        # unchanged file is hashed only once
+        self._file_keys: LRUDict[tuple[str, int, int, str, bool, str], str] = LRUDict(max_size=256)
+        # Concurrency limits shared by every analyze_images_parallel call on this
+        # provider, so overlapping batches can't exceed max_concurrent together.
+        # The provider outlives event loops and a semaphore binds to one, so
+        # they are kept per loop and go away with it.
+        self._batch_limits: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, LRUDict[int, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+
+    async def __aenter__(self) -> "VisionProvider":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Release provider resources. Providers without any need not override."""
 
     @abstractmethod
     async def analyze_video(
@@ -96,11 +203,35 @@ class VisionProvider(ABC):
 
     @abstractmethod
     async def analyze_image(
-        self, image_path: Path, prompt: str, structured: bool = False
+        self, image_path: Path | bytes, prompt: str, structured: bool = False
     ) -> str | AnalysisResult:
-        """Analyze an image file and return the analysis."""
+        """Analyze an image file (or in-memory PNG bytes) and return the analysis."""
         pass
 
+    async def _file_cache_key(self, path: Path, prompt: str, structured: bool, model: str) -> str:
+        """Return the analysis cache key for a file, hashing it only when it changed."""
+        stat = await asyncio.to_thread(path.stat)
+        memo_key = (str(path), stat.st_mtime_ns, stat.st_size, prompt, structured, model)
+        cache_key = self._file_keys.get(memo_key)
+        if cache_key is None:
+            cache_key = await asyncio.to_thread(
+                self._cache.hash_file, path, prompt, structured, model
+            )
+            self._file_keys[memo_key] = cache_key
+        return cache_key
+
+    @staticmethod
+    async def _load_image(image: Path | bytes) -> tuple[bytes, str]:
+        """Return image bytes and MIME type, reading from disk if given a path.
+
+        In-memory images are Playwright screenshots, which are always PNG.
+        """
+        if isinstance(image, bytes):
+            return image, "image/png"
+        # One worker-thread hop for the whole read keeps the event loop free
+        data = await asyncio.to_thread(image.read_bytes)
+        return data, _IMAGE_MIME_TYPES.get(image.suffix.lower(), "image/png")
+
     async def analyze_images_parallel(
         self,
         image_paths: list[Path],
@@ -132,23 +263,35 @@ class VisionProvider(ABC):
                 )
             prompt_list = prompts
 
-        # Use semaphore to limit concurrent API calls
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def analyze_with_limit(path: Path, prompt: str) -> str | AnalysisResult:
-            async with semaphore:
-                return await self.analyze_image(path, prompt, structured)
+        # A fixed pool of workers pulls from one shared iterator, so each job is
+        # claimed once; the provider-wide semaphore also caps overlapping batches
+        results: list[str | AnalysisResult] = [""] * len(image_paths)
+        jobs = enumerate(zip(image_paths, prompt_list, strict=True))
+        loop = asyncio.get_running_loop()
+        loop_limits = self._batch_limits.get(loop)
+        if loop_limits is None:
+            loop_limits = self._batch_limits[loop] = LRUDict(max_size=8)
+        limit = loop_limits.get(max_concurrent)
+        if limit is None:
+            limit = loop_limits[max_concurrent] = asyncio.Semaphore(max_concurrent)
+
+        async def worker() -> None:
+            for index, (path, prompt) in jobs:
+                async with limit:
+                    results[index] = await self.analyze_image(path, prompt, structured)
 
-        # Run all analyses concurrently with rate limiting
-        tasks = [
-            analyze_with_limit(path, prompt)
-            for path, prompt in zip(image_paths, prompt_list, strict=True)
-        ]
-        return await asyncio.gather(*tasks)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(min(max_concurrent, len(image_paths))):
+                    tg.create_task(worker())
+        except ExceptionGroup as group:
+            # Surface the first failure directly, as gather() used to
+            raise group.exceptions[0] from None
+        return results
 
     async def analyze_image_streaming(
         self,
-        image_path: Path,
+        image_path: Path | bytes,
         prompt: str,
     ) -> AsyncGenerator[str, None]:
         """Analyze an image and stream results as they are generated.
@@ -157,7 +300,7 @@ class VisionProvider(ABC):
         Default implementation calls analyze_image and yields the result.
 
         Args:
-            image_path: Path to the image to analyze
+            image_path: Path to the image to analyze, or PNG bytes in memory
             prompt: Analysis prompt
 
         Yields:
@@ -182,54 +325,37 @@ class VisionProvider(ABC):
         try:
             # Try to extract JSON from markdown code blocks if present
             clean_response = response.strip()
-            if clean_response.startswith("```"):
-                # Extract content between code blocks
-                lines = clean_response.split("\n")
-                json_lines = []
-                in_block = False
-                for line in lines:
-                    if line.startswith("```"):
-                        in_block = not in_block
-                        continue
-                    if in_block:
-                        json_lines.append(line)
-                clean_response = "\n".join(json_lines)
-
-            data = json.loads(clean_response)
-
-            findings = []
-            for f in data.get("findings", []):
-                finding = Finding(
-                    id=f.get("id", str(uuid.uuid4())[:8]),
-                    category=IssueCategory(f.get("category", "visual_artifact")),
-                    severity=Severity(f.get("severity", "minor")),
-                    confidence=f.get("confidence", 50),
-                    timestamp=f.get("timestamp"),
-                    element=f.get("element", "Unknown element"),
-                    description=f.get("description", ""),
-                    suggestion=f.get("suggestion", ""),
-                    evidence=f.get("evidence"),
-                )
-                findings.append(finding)
+            fence = _FENCE_RE.match(clean_response)
+            if fence:
+                clean_response = fence.group(1)
+
+            # One pydantic-core pass decodes and validates the whole reply
+            data = _ModelResponse.model_validate_json(clean_response)
+
+            findings: list[Finding] = list(data.findings or ())
 
             return AnalysisResult(
-                id=str(uuid.uuid4())[:8],
+                id=_short_id(),
                 url=url,
                 success=True,
                 findings=findings,
-                summary=data.get("summary", "Analysis complete"),
-                overall_score=data.get("overall_score", 100 - len(findings) * 10),
+                summary=data.summary,
+                overall_score=(
+                    data.overall_score
+                    if data.overall_score is not None
+                    else 100 - len(findings) * 10
+                ),
                 metadata=AnalysisMetadata(
                     provider=provider,
                     model=model,
                     analysis_duration_ms=duration_ms,
                 ),
             )
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except ValueError as e:
             log_extra("Failed to parse structured response", error=str(e))
             # Return a basic result with the raw response as summary
             return AnalysisResult(
-                id=str(uuid.uuid4())[:8],
+                id=_short_id(),
                 url=url,
                 success=True,
                 findings=[],
@@ -261,7 +387,7 @@ class GeminiProvider(VisionProvider):
             raise ValueError(
                 "GEMINI_API_KEY not set. Get a free key at https://aistudio.google.com/"
             )
-        self.client: genai.Client = genai.Client(api_key=settings.gemini_api_key)
+        self.client: genai.Client = _genai_client(settings.gemini_api_key)
         self.model_name: str = settings.vision_model
         log_extra(
             "GeminiProvider initialized",
@@ -269,7 +395,20 @@ class GeminiProvider(VisionProvider):
             provider="gemini",
         )
 
-    @with_retry(VISION_RETRY_CONFIG, vision_circuit)
+    async def _delete_upload(self, file_name: str) -> None:
+        """Delete an uploaded file, ignoring files that are already gone."""
+        # The SDK reports 404/403 as APIError and lets httpx transport errors
+        # through; cleanup runs in the background, so none of these may escape
+        with contextlib.suppress(errors.APIError, httpx.HTTPError, OSError):
+            await self.client.aio.files.delete(name=file_name)
+
+    def _delete_upload_later(self, file_name: str) -> None:
+        """Delete an uploaded file in the background."""
+        task = asyncio.create_task(self._delete_upload(file_name))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    @with_retry(VISION_RETRY_CONFIG, vision_circuit, vision_controller)
     async def analyze_video(
         self, video_path: Path, prompt: str, structured: bool = False
     ) -> str | AnalysisResult:
@@ -286,26 +425,25 @@ class GeminiProvider(VisionProvider):
         start_time = time.monotonic()
 
         # Check cache first
-        cache_key = self._cache.hash_file(video_path, prompt + str(structured))
+        cache_key = await self._file_cache_key(video_path, prompt, structured, self.model_name)
         cached = await self._cache.get(cache_key)
         if cached:
             log_extra("Cache hit for video analysis", video_path=str(video_path))
             if structured:
-                return self._parse_structured_response(cached, "gemini", self.model_name, 0)
+                return AnalysisResult.model_validate_json(cached)
             return cached
 
-        # Build prompt with JSON instruction if structured
-        effective_prompt = prompt + JSON_OUTPUT_INSTRUCTION if structured else prompt
-
         async with timed_operation(
             "analyze_video",
             provider="gemini",
             video_path=str(video_path),
-            prompt_length=len(effective_prompt),
+            prompt_length=len(prompt),
             structured=structured,
         ):
             # Upload the video file using async API
-            video_file = await self.client.aio.files.upload(file=str(video_path))
+            video_file = await self.client.aio.files.upload(
+                file=video_path, config=_VIDEO_UPLOAD_CONFIG
+            )
 
             # Validate file name is present
             if not video_file.name:
@@ -314,6 +452,7 @@ class GeminiProvider(VisionProvider):
 
             # Wait for processing with timeout
             upload_start = time.monotonic()
+            poll_delay = PROCESSING_POLL_INITIAL_SECONDS
             while video_file.state and video_file.state.name == "PROCESSING":
                 elapsed = time.monotonic() - upload_start
                 if elapsed > MAX_PROCESSING_SECONDS:
@@ -321,7 +460,8 @@ class GeminiProvider(VisionProvider):
                         f"Video processing timed out after {MAX_PROCESSING_SECONDS}s "
                         f"for file: {file_name}"
                     )
-                await asyncio.sleep(1)
+                await asyncio.sleep(poll_delay)
+                poll_delay = min(poll_delay * 1.7, PROCESSING_POLL_MAX_SECONDS)
                 video_file = await self.client.aio.files.get(name=file_name)
 
             if video_file.state and video_file.state.name == "FAILED":
@@ -336,39 +476,43 @@ class GeminiProvider(VisionProvider):
                 file_uri=video_file.uri,
                 mime_type="video/webm",
             )
-            prompt_part = types.Part.from_text(text=effective_prompt)
+            prompt_part = types.Part.from_text(text=prompt)
             contents: list[types.Part] = [video_part, prompt_part]
+            if structured:
+                contents.append(_JSON_INSTRUCTION_PART)
             response = await self.client.aio.models.generate_content(
                 model=self.model_name,
                 contents=contents,  # type: ignore[arg-type]
             )
 
-            # Clean up uploaded file (file may already be deleted or not accessible)
-            # Suppress only expected errors: file not found or permission denied
-            with contextlib.suppress(FileNotFoundError, PermissionError, OSError):
-                await self.client.aio.files.delete(name=file_name)
+            # Nothing waits on the delete, so don't hold the result for its round trip
+            self._delete_upload_later(file_name)
 
             result = str(response.text) if response.text else ""
 
-            # Cache the result
-            await self._cache.set(cache_key, result)
-
             duration_ms = int((time.monotonic() - start_time) * 1000)
 
             if structured:
-                return self._parse_structured_response(
-                    result, "gemini", self.model_name, duration_ms
+                # JSON decoding and model validation are CPU-bound; keep them off the loop
+                parsed = await asyncio.to_thread(
+                    self._parse_structured_response, result, "gemini", self.model_name, duration_ms
                 )
+                # Cache the validated model so hits skip re-parsing the raw response
+                await self._cache.set(cache_key, parsed.model_dump_json())
+                return parsed
+
+            # Cache the result
+            await self._cache.set(cache_key, result)
             return result
 
-    @with_retry(VISION_RETRY_CONFIG, vision_circuit)
+    @with_retry(VISION_RETRY_CONFIG, vision_circuit, vision_controller)
     async def analyze_image(
-        self, image_path: Path, prompt: str, structured: bool = False
+        self, image_path: Path | bytes, prompt: str, structured: bool = False
     ) -> str | AnalysisResult:
         """Analyze image using Gemini's vision capabilities.
 
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or PNG bytes already in memory
             prompt: Analysis prompt
             structured: If True, return AnalysisResult with confidence scores
 
@@ -376,42 +520,34 @@ class GeminiProvider(VisionProvider):
             Raw string response or structured AnalysisResult
         """
         start_time = time.monotonic()
+        image_data, mime_type = await self._load_image(image_path)
+        image_label = _image_label(image_path)
 
         # Check cache first
-        cache_key = self._cache.hash_file(image_path, prompt + str(structured))
+        cache_key = self._cache.hash_bytes(image_data, prompt, structured, self.model_name)
         cached = await self._cache.get(cache_key)
         if cached:
-            log_extra("Cache hit for image analysis", image_path=str(image_path))
+            log_extra("Cache hit for image analysis", image_path=image_label)
             if structured:
-                return self._parse_structured_response(cached, "gemini", self.model_name, 0)
+                return AnalysisResult.model_validate_json(cached)
             return cached
 
-        # Build prompt with JSON instruction if structured
-        effective_prompt = prompt + JSON_OUTPUT_INSTRUCTION if structured else prompt
-
         async with timed_operation(
             "analyze_image",
             provider="gemini",
-            image_path=str(image_path),
-            prompt_length=len(effective_prompt),
+            image_path=image_label,
+            prompt_length=len(prompt),
             structured=structured,
         ):
-            # Use async file I/O to avoid blocking the event loop
-            async with aiofiles.open(image_path, "rb") as f:
-                image_data = await f.read()
-
-            # Detect MIME type from file extension
-            mime_type, _ = mimetypes.guess_type(str(image_path))
-            if mime_type is None:
-                mime_type = "image/png"  # fallback
-
             # Use Part.from_bytes for image data
             image_part = types.Part.from_bytes(
                 data=image_data,
                 mime_type=mime_type,
             )
-            prompt_part = types.Part.from_text(text=effective_prompt)
+            prompt_part = types.Part.from_text(text=prompt)
             contents: list[types.Part] = [image_part, prompt_part]
+            if structured:
+                contents.append(_JSON_INSTRUCTION_PART)
 
             response = await self.client.aio.models.generate_content(
                 model=self.model_name,
@@ -419,60 +555,89 @@ class GeminiProvider(VisionProvider):
             )
             result = str(response.text) if response.text else ""
 
-            # Cache the result
-            await self._cache.set(cache_key, result)
-
             duration_ms = int((time.monotonic() - start_time) * 1000)
 
             if structured:
-                return self._parse_structured_response(
-                    result, "gemini", self.model_name, duration_ms
+                parsed = await asyncio.to_thread(
+                    self._parse_structured_response, result, "gemini", self.model_name, duration_ms
                 )
+                # Cache the validated model so hits skip re-parsing the raw response
+                await self._cache.set(cache_key, parsed.model_dump_json())
+                return parsed
+
+            # Cache the result
+            await self._cache.set(cache_key, result)
             return result
 
     async def analyze_image_streaming(
         self,
-        image_path: Path,
+        image_path: Path | bytes,
         prompt: str,
     ) -> AsyncGenerator[str, None]:
         """Analyze an image and stream results as they are generated.
 
-        Uses Gemini's streaming API to yield text chunks as they arrive.
+        Uses Gemini's streaming API to yield text chunks as they arrive. Shares
+        the cache with non-structured analyze_image(): a cached analysis is
+        yielded as a single chunk, and a completed stream is cached. Opening
+        the stream is retried, and the outcome is reported to the shared
+        vision circuit breaker like the buffered calls.
 
         Args:
-            image_path: Path to the image to analyze
+            image_path: Path to the image to analyze, or PNG bytes in memory
             prompt: Analysis prompt
 
         Yields:
             Chunks of the analysis text as they are generated
         """
-        async with timed_operation(
-            "analyze_image_streaming",
-            provider="gemini",
-            image_path=str(image_path),
-            prompt_length=len(prompt),
-        ):
-            # Use async file I/O
-            async with aiofiles.open(image_path, "rb") as f:
-                image_data = await f.read()
-
-            # Detect MIME type
-            mime_type, _ = mimetypes.guess_type(str(image_path))
-            if mime_type is None:
-                mime_type = "image/png"
+        image_data, mime_type = await self._load_image(image_path)
+        cache_key = self._cache.hash_bytes(image_data, prompt, model=self.model_name)
+        cached = await self._cache.get(cache_key)
+        if cached:
+            yield cached
+            return
 
-            # Build contents
-            image_part = types.Part.from_bytes(data=image_data, mime_type=mime_type)
-            prompt_part = types.Part.from_text(text=prompt)
-            contents: list[types.Part] = [image_part, prompt_part]
+        # A generator can't take @with_retry, so gate on the breaker here
+        admission = vision_circuit.try_acquire()
+        if not admission:
+            raise CircuitOpenError(f"Circuit breaker {vision_circuit.name} is open")
 
-            # Use streaming API
-            async for chunk in await self.client.aio.models.generate_content_stream(
-                model=self.model_name,
-                contents=contents,  # type: ignore[arg-type]
+        try:
+            async with timed_operation(
+                "analyze_image_streaming",
+                provider="gemini",
+                image_path=_image_label(image_path),
+                prompt_length=len(prompt),
             ):
-                if chunk.text:
-                    yield chunk.text
+                # Build contents
+                image_part = types.Part.from_bytes(data=image_data, mime_type=mime_type)
+                prompt_part = types.Part.from_text(text=prompt)
+                contents: list[types.Part] = [image_part, prompt_part]
+
+                # Use streaming API
+                chunks: list[str] = []
+                async for chunk in await self._open_stream(contents):
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
+        except VISION_RETRY_CONFIG.retry_exceptions:
+            vision_circuit.record_failure()
+            raise
+        finally:
+            if admission is Admission.PROBE:
+                vision_circuit.release()
+
+        vision_circuit.record_success()
+        await self._cache.set(cache_key, "".join(chunks))
+
+    @with_retry(VISION_RETRY_CONFIG, controller=vision_controller)
+    async def _open_stream(
+        self, contents: list[types.Part]
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        """Start a streaming generation, retrying transient failures to connect."""
+        return await self.client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,  # type: ignore[arg-type]
+        )
 
 
 class OllamaProvider(VisionProvider):
@@ -489,12 +654,10 @@ class OllamaProvider(VisionProvider):
     def __init__(self) -> None:
         super().__init__()
         try:
-            import ollama
-
             # NOTE: Using Any type for ollama client because the ollama package
             # lacks proper type stubs. TODO: Add proper typing when ollama publishes stubs
             # or create a Protocol interface for the methods we use.
-            self.client: Any = ollama.AsyncClient(host=settings.ollama_host)
+            self.client: Any = _ollama_client(settings.ollama_host)
             self.model = settings.ollama_model
             log_extra(
                 "OllamaProvider initialized",
@@ -518,12 +681,12 @@ class OllamaProvider(VisionProvider):
 
     @with_retry(VISION_RETRY_CONFIG)
     async def analyze_image(
-        self, image_path: Path, prompt: str, structured: bool = False
+        self, image_path: Path | bytes, prompt: str, structured: bool = False
     ) -> str | AnalysisResult:
         """Analyze image using Ollama's vision model.
 
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file, or PNG bytes already in memory
             prompt: Analysis prompt
             structured: If True, return AnalysisResult with confidence scores
 
@@ -531,14 +694,16 @@ class OllamaProvider(VisionProvider):
             Raw string response or structured AnalysisResult
         """
         start_time = time.monotonic()
+        image_bytes, _ = await self._load_image(image_path)
+        image_label = _image_label(image_path)
 
         # Check cache first
-        cache_key = self._cache.hash_file(image_path, prompt + str(structured))
+        cache_key = self._cache.hash_bytes(image_bytes, prompt, structured, self.model)
         cached = await self._cache.get(cache_key)
         if cached:
-            log_extra("Cache hit for image analysis", image_path=str(image_path))
+            log_extra("Cache hit for image analysis", image_path=image_label)
             if structured:
-                return self._parse_structured_response(cached, "ollama", self.model, 0)
+                return AnalysisResult.model_validate_json(cached)
             return cached
 
         # Build prompt with JSON instruction if structured
@@ -547,13 +712,13 @@ class OllamaProvider(VisionProvider):
         async with timed_operation(
             "analyze_image",
             provider="ollama",
-            image_path=str(image_path),
+            image_path=image_label,
             prompt_length=len(effective_prompt),
             structured=structured,
         ):
-            # Use async file I/O to avoid blocking the event loop
-            async with aiofiles.open(image_path, "rb") as f:
-                image_data = base64.b64encode(await f.read()).decode("utf-8")
+            # Encoding a large screenshot is pure CPU work, so keep it off the loop
+            encoded = await asyncio.to_thread(base64.b64encode, image_bytes)
+            image_data = encoded.decode("ascii")
 
             response: OllamaResponse = await self.client.chat(
                 model=self.model,
@@ -567,18 +732,28 @@ class OllamaProvider(VisionProvider):
             )
             result = str(response["message"]["content"])
 
-            # Cache the result
-            await self._cache.set(cache_key, result)
-
             duration_ms = int((time.monotonic() - start_time) * 1000)
 
             if structured:
-                return self._parse_structured_response(result, "ollama", self.model, duration_ms)
+                parsed = await asyncio.to_thread(
+                    self._parse_structured_response, result, "ollama", self.model, duration_ms
+                )
+                # Cache the validated model so hits skip re-parsing the raw response
+                await self._cache.set(cache_key, parsed.model_dump_json())
+                return parsed
+
+            # Cache the result
+            await self._cache.set(cache_key, result)
             return result
 
 
+@functools.cache
 def get_vision_provider() -> VisionProvider:
-    """Factory function to get the configured vision provider."""
+    """Return the configured vision provider, built once per process.
+
+    The provider only depends on settings fixed at startup; tests that
+    change them call get_vision_provider.cache_clear().
+    """
     if settings.vision_provider == "ollama":
         return OllamaProvider()
     return GeminiProvider()
@@ -1,11 +1,14 @@
 """Tests for AnimaWatch browser automation module."""
 
+import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from animawatch.browser import BrowserRecorder
+from animawatch.config import settings
+from animawatch.models import Action
 
 
 class TestBrowserRecorder:
@@ -129,6 +132,107 @@ class TestBrowserRecorder:
         mock_page.screenshot.assert_called_once()
         mock_context.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_concurrent_first_use_launches_browser_once(
+        self, recorder: BrowserRecorder
+    ) -> None:
+        """Test simultaneous first calls share a single browser launch."""
+        mock_playwright = MagicMock()
+        mock_playwright.chromium.launch = AsyncMock(return_value=AsyncMock())
+
+        with patch("animawatch.browser.async_playwright") as mock_async_pw:
+            mock_async_pw.return_value.start = AsyncMock(return_value=mock_playwright)
+            browsers = await asyncio.gather(*(recorder._ensure_started() for _ in range(3)))
+
+        mock_playwright.chromium.launch.assert_awaited_once()
+        assert all(browser is recorder._browser for browser in browsers)
+
+    @pytest.mark.asyncio
+    async def test_take_screenshot_bytes_skips_disk(self, recorder: BrowserRecorder) -> None:
+        """Test take_screenshot_bytes returns Playwright's bytes without a path."""
+        mock_page = AsyncMock()
+        mock_page.screenshot = AsyncMock(return_value=b"\x89PNG")
+        mock_context = AsyncMock()
+        mock_context.new_page = AsyncMock(return_value=mock_page)
+        recorder._browser = AsyncMock()
+        recorder._browser.new_context = AsyncMock(return_value=mock_context)
+
+        result = await recorder.take_screenshot_bytes("https://example.com", full_page=False)
+
+        assert result == b"\x89PNG"
+        mock_page.screenshot.assert_awaited_once_with(full_page=False)
+        mock_context.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_fills_pool_up_to_size(self) -> None:
+        """Test prewarm opens contexts only up to the pool size."""
+        recorder = BrowserRecorder(pool_size=2)
+        mock_browser = AsyncMock()
+        recorder._browser = mock_browser
+
+        assert await recorder.prewarm(5) == 2
+        assert await recorder.prewarm(5) == 0
+        assert len(recorder._context_pool) == 2
+        assert mock_browser.new_context.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pooled_screenshot_reuses_prewarmed_context(
+        self, recorder: BrowserRecorder
+    ) -> None:
+        """Test pooled screenshots take a warm context and swap it for a fresh one."""
+        used_context = AsyncMock()
+        fresh_context = AsyncMock()
+        recorder._browser = AsyncMock()
+        recorder._browser.new_context = AsyncMock(return_value=fresh_context)
+        recorder._context_pool = [used_context]
+
+        result = await recorder.take_screenshot("https://example.com", use_pool=True)
+        result.unlink(missing_ok=True)
+
+        # The swap happens after the caller gets its screenshot
+        used_context.new_page.assert_awaited_once()
+        used_context.close.assert_not_awaited()
+        await asyncio.gather(*recorder._refills)
+
+        used_context.close.assert_awaited_once()
+        recorder._browser.new_context.assert_awaited_once_with(viewport=settings.video_size)
+        assert recorder._context_pool == [fresh_context]
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_pending_refills(self, recorder: BrowserRecorder) -> None:
+        """Test stop() leaves no refill running or context in the pool."""
+        recorder._browser = AsyncMock()
+
+        async with recorder.pooled_context():
+            pass
+        assert recorder._refills
+
+        await recorder.stop()
+
+        assert not recorder._refills
+        assert recorder._context_pool == []
+
+    @pytest.mark.asyncio
+    async def test_pooled_context_does_not_leak_storage(self, recorder: BrowserRecorder) -> None:
+        """Test a localStorage value set in one capture is gone in the next."""
+
+        def new_context(**_: object) -> AsyncMock:
+            storage: dict[str, str] = {}
+            page = AsyncMock()
+            page.evaluate = AsyncMock(side_effect=lambda script: storage.get("token"))
+            context = AsyncMock()
+            context.new_page = AsyncMock(return_value=page)
+            context.storage = storage
+            return context
+
+        recorder._browser = AsyncMock()
+        recorder._browser.new_context = AsyncMock(side_effect=new_context)
+
+        async with recorder.pooled_context() as (context, _):
+            context.storage["token"] = "secret"
+        async with recorder.pooled_context() as (_, page):
+            assert await page.evaluate("localStorage.getItem('token')") is None
+
 
 class TestBrowserRecorderActions:
     """Tests for BrowserRecorder action handling."""
@@ -142,7 +246,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_click(self, recorder: BrowserRecorder) -> None:
         """Test click action."""
         mock_page = AsyncMock()
-        action = {"type": "click", "selector": "#button"}
+        action = Action(type="click", selector="#button")
 
         await recorder._perform_action(mock_page, action)
 
@@ -152,7 +256,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_type(self, recorder: BrowserRecorder) -> None:
         """Test type action."""
         mock_page = AsyncMock()
-        action = {"type": "type", "selector": "#input", "text": "hello"}
+        action = Action(type="type", selector="#input", text="hello")
 
         await recorder._perform_action(mock_page, action)
 
@@ -162,7 +266,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_scroll(self, recorder: BrowserRecorder) -> None:
         """Test scroll action."""
         mock_page = AsyncMock()
-        action = {"type": "scroll", "y": 300}
+        action = Action(type="scroll", y=300)
 
         await recorder._perform_action(mock_page, action)
 
@@ -172,7 +276,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_hover(self, recorder: BrowserRecorder) -> None:
         """Test hover action."""
         mock_page = AsyncMock()
-        action = {"type": "hover", "selector": "#menu"}
+        action = Action(type="hover", selector="#menu")
 
         await recorder._perform_action(mock_page, action)
 
@@ -182,7 +286,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_wait(self, recorder: BrowserRecorder) -> None:
         """Test wait action."""
         mock_page = AsyncMock()
-        action = {"type": "wait", "duration": 0.1}
+        action = Action(type="wait", duration=0.1)
 
         with patch("animawatch.browser.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
             await recorder._perform_action(mock_page, action)
@@ -192,7 +296,7 @@ class TestBrowserRecorderActions:
     async def test_perform_action_unknown_type(self, recorder: BrowserRecorder) -> None:
         """Test that unknown action types are ignored."""
         mock_page = AsyncMock()
-        action = {"type": "unknown_action"}
+        action = Action(type="unknown_action")
 
         # Should not raise
         await recorder._perform_action(mock_page, action)
@@ -201,8 +305,29 @@ class TestBrowserRecorderActions:
     async def test_perform_action_click_without_selector(self, recorder: BrowserRecorder) -> None:
         """Test click action without selector does nothing."""
         mock_page = AsyncMock()
-        action = {"type": "click"}
+        action = Action(type="click")
 
         await recorder._perform_action(mock_page, action)
 
         mock_page.click.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_record_interaction_validates_dict_actions(
+        self, recorder: BrowserRecorder
+    ) -> None:
+        """Test raw dict actions are coerced to Action models before they run."""
+        mock_page = AsyncMock()
+        mock_page.video = AsyncMock()
+        mock_page.video.path = AsyncMock(return_value="/tmp/video.webm")
+        mock_context = AsyncMock()
+        mock_context.new_page = AsyncMock(return_value=mock_page)
+        recorder._browser = AsyncMock()
+        recorder._browser.new_context = AsyncMock(return_value=mock_context)
+
+        with patch("animawatch.browser.asyncio.sleep", new_callable=AsyncMock):
+            path = await recorder.record_interaction(
+                "https://example.com", actions=[{"type": "scroll", "y": "250"}], wait_time=0
+            )
+
+        assert path == Path("/tmp/video.webm")
+        mock_page.evaluate.assert_called_once_with("window.scrollBy(0, 250)")
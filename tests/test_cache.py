@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from animawatch.cache import AnalysisCache, analysis_cache
+from animawatch.cache import AnalysisCache, LRUDict, analysis_cache
 
 
 class TestAnalysisCache:
@@ -120,6 +120,55 @@ class TestAnalysisCache:
         finally:
             path.unlink()
 
+    def test_hash_file_matches_hash_bytes(self, tmp_path: Path) -> None:
+        """Test streaming a file gives the same key as hashing its bytes."""
+        path = tmp_path / "video.webm"
+        path.write_bytes(b"frame" * 100_000)
+
+        assert AnalysisCache.hash_file(path, "p", True) == AnalysisCache.hash_bytes(
+            path.read_bytes(), "p", True
+        )
+
+    def test_hash_bytes_separates_structured_mode(self) -> None:
+        """Test that structured and raw requests get different keys."""
+        assert AnalysisCache.hash_bytes(b"content", "prompt") != AnalysisCache.hash_bytes(
+            b"content", "prompt", structured=True
+        )
+
+    def test_hash_bytes_separates_models(self) -> None:
+        """Test that answers from different models never share a key."""
+        assert AnalysisCache.hash_bytes(b"content", "prompt", model="gemini") != (
+            AnalysisCache.hash_bytes(b"content", "prompt", model="qwen2.5-vl")
+        )
+
+
+class TestLRUDict:
+    """Tests for the bounded LRUDict."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the oldest untouched entry is evicted past max_size."""
+        evicted: list[tuple[str, int]] = []
+        lru: LRUDict[str, int] = LRUDict(2, on_evict=lambda k, v: evicted.append((k, v)))
+        lru["a"] = 1
+        lru["b"] = 2
+        assert lru["a"] == 1  # refresh "a"
+        lru["c"] = 3
+
+        assert list(lru) == ["a", "c"]
+        assert evicted == [("b", 2)]
+
+    def test_get_refreshes_and_defaults(self) -> None:
+        """Test get() refreshes recency and falls back to the default."""
+        lru: LRUDict[str, int] = LRUDict(2)
+        lru["a"] = 1
+        lru["b"] = 2
+        assert lru.get("a") == 1
+        assert lru.get("missing") is None
+        lru["c"] = 3
+
+        assert "a" in lru
+        assert "b" not in lru
+
 
 class TestGlobalCache:
     """Tests for the global analysis_cache instance."""
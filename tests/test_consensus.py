@@ -1,11 +1,17 @@
 """Tests for multi-model consensus in animawatch.consensus."""
 
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from animawatch.config import settings
 from animawatch.consensus import (
     ConsensusResult,
     _findings_similar,
     _max_severity,
+    analyze_with_consensus,
 )
-from animawatch.models import Finding, IssueCategory, Severity
+from animawatch.models import AnalysisResult, Finding, IssueCategory, Severity
 
 
 class TestConsensusResult:
@@ -188,3 +194,38 @@ class TestMaxSeverity:
     def test_critical_vs_info(self) -> None:
         """Test extremes."""
         assert _max_severity(Severity.CRITICAL, Severity.INFO) == Severity.CRITICAL
+
+
+class TestAnalyzeWithConsensus:
+    """Tests for running providers in analyze_with_consensus."""
+
+    async def test_providers_run_concurrently(self) -> None:
+        """Test both providers are in flight at once without touching settings."""
+        original = settings.vision_provider
+        started: list[str] = []
+        both_started = asyncio.Event()
+
+        def make_provider(name: str) -> MagicMock:
+            async def analyze_image(*_args: object, **_kwargs: object) -> AnalysisResult:
+                started.append(name)
+                assert settings.vision_provider == original
+                if len(started) == 2:
+                    both_started.set()
+                await asyncio.wait_for(both_started.wait(), timeout=1)
+                return AnalysisResult.model_construct(id=name, findings=[])
+
+            provider = MagicMock()
+            provider.analyze_image = analyze_image
+            return provider
+
+        result = await analyze_with_consensus(
+            Path("shot.png"),
+            "prompt",
+            gemini_provider=make_provider("gemini"),
+            ollama_provider=make_provider("ollama"),
+        )
+
+        assert sorted(started) == ["gemini", "ollama"]
+        assert result.gemini_result is not None
+        assert result.ollama_result is not None
+        assert settings.vision_provider == original
@@ -2,9 +2,12 @@
 
 from pathlib import Path
 
+from PIL import Image
+
 from animawatch.grounding import (
     GroundedFinding,
     VerificationResult,
+    _image_size,
     _parse_verification,
     apply_verification_result,
     create_grounded_prompt,
@@ -110,6 +113,24 @@ class TestParseBoundingBox:
         assert box is None
 
 
+class TestImageSize:
+    """Tests for _image_size helper."""
+
+    def test_reads_dimensions(self, tmp_path: Path) -> None:
+        """Test reading dimensions from an image file."""
+        path = tmp_path / "test.png"
+        Image.new("RGB", (120, 80)).save(path)
+        assert _image_size(str(path), path.stat().st_mtime_ns) == (120, 80)
+
+    def test_rereads_when_file_changes(self, tmp_path: Path) -> None:
+        """Test that a rewritten file is not served stale dimensions."""
+        path = tmp_path / "test.png"
+        Image.new("RGB", (120, 80)).save(path)
+        assert _image_size(str(path), 1) == (120, 80)
+        Image.new("RGB", (60, 40)).save(path)
+        assert _image_size(str(path), 2) == (60, 40)
+
+
 class TestParseVerification:
     """Tests for _parse_verification function."""
 
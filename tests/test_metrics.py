@@ -1,5 +1,9 @@
 """Tests for performance metrics in animawatch.metrics."""
 
+import dataclasses
+
+import pytest
+
 from animawatch.metrics import (
     CoreWebVitals,
     MetricsThresholds,
@@ -44,6 +48,12 @@ class TestMetricsThresholds:
         assert t.cls_good == 0.1
         assert t.cls_poor == 0.25
 
+    def test_thresholds_are_frozen(self) -> None:
+        """Test thresholds cannot be mutated (the default instance is shared)."""
+        t = MetricsThresholds()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            t.lcp_good_ms = 1.0  # type: ignore[misc]
+
 
 class TestPerformanceMetrics:
     """Tests for PerformanceMetrics dataclass."""
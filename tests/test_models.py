@@ -1,5 +1,8 @@
 """Tests for Pydantic models in animawatch.models."""
 
+import pytest
+from pydantic import ValidationError
+
 from animawatch.models import (
     AnalysisMetadata,
     AnalysisResult,
@@ -88,6 +91,20 @@ class TestFinding:
         assert finding.element == ".button"
         assert finding.bounding_box == box
 
+    def test_finding_is_frozen(self) -> None:
+        """Test findings are immutable so they can be shared safely."""
+        finding = Finding(
+            id="test-3",
+            category=IssueCategory.LAYOUT,
+            severity=Severity.MINOR,
+            confidence=60,
+            element="nav",
+            description="Overlap",
+            suggestion="Adjust z-index",
+        )
+        with pytest.raises(ValidationError):
+            finding.confidence = 10  # type: ignore[misc]
+
 
 class TestAnalysisMetadata:
     """Tests for AnalysisMetadata model."""
@@ -170,6 +187,8 @@ class TestAnalysisResult:
         assert result.major_count == 1
         assert result.minor_count == 1
         assert result.average_confidence == 80.0
+        assert "**Findings**: 3 (1 critical, 1 major, 1 minor)" in result.to_markdown()
+        assert "**Avg Confidence**: 80.0%" in result.to_markdown()
 
     def test_to_markdown(self) -> None:
         """Test markdown output generation."""
@@ -0,0 +1,232 @@
+"""Tests for retry logic and circuit breaker in animawatch.retry."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from animawatch.retry import (
+    _HALF_OPEN,
+    Admission,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryConfig,
+    RetryController,
+    calculate_delay,
+    with_retry,
+)
+
+
+class TestCalculateDelay:
+    """Tests for backoff delay calculation."""
+
+    def test_full_jitter_spans_whole_window(self) -> None:
+        """Test full jitter stays within [0, capped backoff]."""
+        config = RetryConfig(base_delay=1.0, max_delay=5.0, jitter_mode="full")
+        with patch("animawatch.retry._rand", return_value=0.0):
+            assert calculate_delay(3, config) == 0.0
+        with patch("animawatch.retry._rand", return_value=0.999):
+            assert calculate_delay(3, config) == pytest.approx(4.995)
+
+    def test_decorrelated_jitter_grows_from_previous_delay(self) -> None:
+        """Test decorrelated jitter draws from [base_delay, 3 * prev_delay], capped."""
+        config = RetryConfig(base_delay=1.0, max_delay=10.0, jitter_mode="decorrelated")
+        with patch("animawatch.retry._rand", return_value=0.5):
+            assert calculate_delay(0, config, prev_delay=2.0) == pytest.approx(3.5)
+            assert calculate_delay(0, config, prev_delay=8.0) == 10.0
+
+    def test_symmetric_jitter(self) -> None:
+        """Test symmetric mode keeps the legacy +/- jitter behavior."""
+        config = RetryConfig(base_delay=1.0, jitter=0.5, jitter_mode="symmetric")
+        with patch("animawatch.retry._rand", return_value=0.0):
+            assert calculate_delay(1, config) == pytest.approx(1.0)
+        with patch("animawatch.retry._rand", return_value=0.5):
+            assert calculate_delay(1, config) == pytest.approx(2.0)
+
+
+class TestWithRetry:
+    """Tests for the with_retry decorator."""
+
+    def test_trivial_config_returns_function_unwrapped(self) -> None:
+        """Test that no retries and no breaker skips the wrapper entirely."""
+
+        async def call_api() -> str:
+            return "ok"
+
+        assert with_retry(RetryConfig(max_retries=0))(call_api) is call_api
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self) -> None:
+        """Test that retryable errors are retried until success."""
+        func = AsyncMock(side_effect=[ConnectionError("boom"), "ok"])
+        func.__name__ = "call_api"
+
+        with patch("animawatch.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await with_retry(RetryConfig(max_retries=2))(func)()
+
+        assert result == "ok"
+        assert func.await_count == 2
+        mock_sleep.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_calls(self) -> None:
+        """Test that an open circuit fails fast without calling the function."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0, name="test")
+        breaker.record_failure()
+        func = AsyncMock(return_value="ok")
+        func.__name__ = "call_api"
+
+        with pytest.raises(CircuitOpenError):
+            await with_retry(RetryConfig(max_retries=0), breaker)(func)()
+
+        func.assert_not_awaited()
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker state machine."""
+
+    def test_opens_after_threshold(self) -> None:
+        """Test the circuit opens once failures reach the threshold."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+        breaker.record_failure()
+        assert breaker.is_open is False
+        breaker.record_failure()
+        assert breaker.is_open is True
+
+    def test_closed_circuit_skips_clock(self) -> None:
+        """Test the CLOSED fast path never reads the monotonic clock."""
+        breaker = CircuitBreaker()
+        with patch("animawatch.retry.time.monotonic_ns") as mock_clock:
+            assert breaker.is_open is False
+            assert breaker.try_acquire() is Admission.ADMITTED
+        mock_clock.assert_not_called()
+        assert breaker.state == "CLOSED"
+
+    def test_allows_request_after_recovery_timeout(self) -> None:
+        """Test the circuit lets a request through once the timeout elapses."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.5)
+        with patch("animawatch.retry.time.monotonic_ns", return_value=1_000_000_000):
+            breaker.record_failure()
+        with patch("animawatch.retry.time.monotonic_ns", return_value=1_400_000_000):
+            assert breaker.is_open is True
+        with patch("animawatch.retry.time.monotonic_ns", return_value=1_500_000_000):
+            assert breaker.is_open is False
+
+    def test_half_open_admits_single_probe(self) -> None:
+        """Test only one request is let through while HALF_OPEN."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.0)
+        breaker.record_failure()
+
+        assert breaker.try_acquire() is Admission.PROBE
+        assert breaker.state == "HALF_OPEN"
+        assert breaker.try_acquire() is Admission.REJECTED
+        assert breaker.is_open is True
+
+        breaker.release()
+        assert breaker.try_acquire() is Admission.PROBE
+
+    def test_failed_probe_reopens(self) -> None:
+        """Test a failing probe sends the circuit straight back to OPEN."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker._state = _HALF_OPEN
+
+        breaker.record_failure()
+
+        assert breaker.state == "OPEN"
+
+    def test_successes_decay_failures_before_closing(self) -> None:
+        """Test HALF_OPEN closes only once successes have decayed all failures."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.try_acquire() is Admission.PROBE
+
+        breaker.record_success()
+        assert breaker.state == "HALF_OPEN"
+        breaker.record_success()
+        assert breaker.state == "CLOSED"
+
+    @pytest.mark.asyncio
+    async def test_with_retry_stops_retrying_once_circuit_opens(self) -> None:
+        """Test the retry loop gives up as soon as the breaker trips."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0)
+        func = AsyncMock(side_effect=ConnectionError("down"))
+        func.__name__ = "call_api"
+
+        with (
+            patch("animawatch.retry.asyncio.sleep", new_callable=AsyncMock),
+            pytest.raises(ConnectionError),
+        ):
+            await with_retry(RetryConfig(max_retries=3), breaker)(func)()
+
+        assert func.await_count == 1
+
+    def test_recovery_timeout_round_trips(self) -> None:
+        """Test the float recovery_timeout API is preserved."""
+        breaker = CircuitBreaker(recovery_timeout=1.5)
+        assert breaker.recovery_timeout == 1.5
+        breaker.recovery_timeout = 2.0
+        assert breaker.recovery_timeout == 2.0
+
+
+class TestRetryController:
+    """Tests for the adaptive RetryController."""
+
+    def test_allows_retries_below_min_samples(self) -> None:
+        """Test a few failures are not enough to declare a storm."""
+        controller = RetryController(min_samples=5)
+        for _ in range(4):
+            controller.record(False)
+        assert controller.allow_retries() is True
+
+    def test_suppresses_retries_during_storm(self) -> None:
+        """Test retries stop once the failure rate crosses the threshold."""
+        controller = RetryController(min_samples=4, rejection_threshold=0.5)
+        for success in (True, False, False, False):
+            controller.record(success)
+        assert controller.rejection_rate == 0.75
+        assert controller.allow_retries() is False
+
+    def test_probe_after_cooldown_and_recovery(self) -> None:
+        """Test one call may retry after the cooldown, and recovery re-enables."""
+        controller = RetryController(window_seconds=100.0, min_samples=2, cooldown_seconds=10.0)
+        with patch("animawatch.retry.time.monotonic_ns", return_value=0):
+            controller.record(False)
+            controller.record(False)
+            assert controller.allow_retries() is False
+        with patch("animawatch.retry.time.monotonic_ns", return_value=10_000_000_000):
+            assert controller.allow_retries() is True
+            assert controller.allow_retries() is False
+        with patch("animawatch.retry.time.monotonic_ns", return_value=200_000_000_000):
+            # Old failures have left the window
+            assert controller.allow_retries() is True
+
+    @pytest.mark.asyncio
+    async def test_with_retry_makes_single_attempt_during_storm(self) -> None:
+        """Test with_retry skips retries while the controller reports a storm."""
+        controller = RetryController(min_samples=1)
+        controller.record(False)
+        func = AsyncMock(side_effect=ConnectionError("down"))
+        func.__name__ = "call_api"
+
+        with (
+            patch("animawatch.retry.asyncio.sleep", new_callable=AsyncMock) as mock_sleep,
+            pytest.raises(ConnectionError),
+        ):
+            await with_retry(RetryConfig(max_retries=3), controller=controller)(func)()
+
+        assert func.await_count == 1
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_with_retry_reports_to_controller_without_retries(self) -> None:
+        """Test a controller still sees outcomes when max_retries is zero."""
+        controller = RetryController(min_samples=1)
+        func = AsyncMock(side_effect=ConnectionError("down"))
+        func.__name__ = "call_api"
+
+        with pytest.raises(ConnectionError):
+            await with_retry(RetryConfig(max_retries=0), controller=controller)(func)()
+
+        assert controller.rejection_rate == 1.0
@@ -1,5 +1,7 @@
 """Tests for AnimaWatch MCP server module."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import cast
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -49,6 +51,45 @@ class TestAppContext:
         assert ctx.recordings["abc123"] == Path("/tmp/video.webm")
         assert ctx.analyses["abc123"] == "Analysis result"
 
+    def test_app_context_stores_are_bounded(self, tmp_path: Path) -> None:
+        """Test recordings and analyses evict old entries past the limit."""
+        with patch("animawatch.server.settings") as mock_settings:
+            mock_settings.max_stored_recordings = 1
+            mock_settings.max_stored_analyses = 2
+            ctx = AppContext(browser=MagicMock(), vision=MagicMock())
+
+        kept = tmp_path / "kept.webm"
+        kept.write_bytes(b"video")
+        ctx.recordings["a"] = kept
+        ctx.recordings["b"] = tmp_path / "other.webm"
+        for key in ("x", "y", "z"):
+            ctx.analyses[key] = key
+
+        assert list(ctx.recordings) == ["b"]
+        assert list(ctx.analyses) == ["y", "z"]
+        # Recordings outside our temp dirs are never deleted on eviction
+        assert kept.exists()
+
+    def test_evicted_temp_recording_is_deleted(self, tmp_path: Path) -> None:
+        """Test evicting a recording from an animawatch temp dir removes it."""
+        video_dir = tmp_path / "animawatch-abc"
+        video_dir.mkdir()
+        video = video_dir / "video.webm"
+        video.write_bytes(b"video")
+
+        with (
+            patch("animawatch.server.settings") as mock_settings,
+            patch("animawatch.server._TEMP_DIR", tmp_path),
+        ):
+            mock_settings.max_stored_recordings = 1
+            mock_settings.max_stored_analyses = 1
+            ctx = AppContext(browser=MagicMock(), vision=MagicMock())
+            ctx.recordings["a"] = video
+            ctx.recordings["b"] = tmp_path / "next.webm"
+
+        assert not video.exists()
+        assert not video_dir.exists()
+
 
 class TestPrompts:
     """Tests for MCP prompt templates."""
@@ -71,6 +112,20 @@ class TestPrompts:
         assert result == ANIMATION_PROMPT
         assert "FOCUS SPECIFICALLY ON" not in result
 
+    def test_animation_diagnosis_is_memoized(self) -> None:
+        """Test repeated focus areas reuse the same prompt string."""
+        first = animation_diagnosis(focus_area="scroll effects")
+        assert animation_diagnosis(focus_area="scroll effects") is first
+
+    def test_default_prompts_are_shared_constants(self) -> None:
+        """Test the default and accessibility prompts are not rebuilt per call."""
+        from animawatch.server import _focused_animation_prompt
+
+        _focused_animation_prompt.cache_clear()
+        assert animation_diagnosis() is ANIMATION_PROMPT
+        assert accessibility_check() is accessibility_check()
+        assert _focused_animation_prompt.cache_info().currsize == 0
+
     def test_page_analysis_default(self) -> None:
         """Test page_analysis returns prompt with default aspects."""
         result = page_analysis()
@@ -93,7 +148,8 @@ class TestPrompts:
 class TestResources:
     """Tests for MCP resources."""
 
-    def test_get_recording_found(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_recording_found(self) -> None:
         """Test get_recording returns info when recording exists."""
         mock_ctx = MagicMock()
         mock_ctx.request_context.lifespan_context = AppContext(
@@ -103,12 +159,13 @@ class TestResources:
             analyses={},
         )
 
-        result = get_recording("abc123", mock_ctx)
+        result = await get_recording("abc123", mock_ctx)
 
         assert "abc123" in result
         assert "/tmp/video.webm" in result
 
-    def test_get_recording_not_found(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_recording_not_found(self) -> None:
         """Test get_recording returns not found message."""
         mock_ctx = MagicMock()
         mock_ctx.request_context.lifespan_context = AppContext(
@@ -118,7 +175,7 @@ class TestResources:
             analyses={},
         )
 
-        result = get_recording("nonexistent", mock_ctx)
+        result = await get_recording("nonexistent", mock_ctx)
 
         assert "not found" in result
         assert "nonexistent" in result
@@ -151,8 +208,10 @@ class TestResources:
 
         assert "not found" in result
 
-    def test_get_config_returns_settings(self) -> None:
-        """Test get_config returns current configuration."""
+    def test_render_config_uses_settings(self) -> None:
+        """Test the config resource body is rendered from settings."""
+        from animawatch.server import _render_config
+
         with patch("animawatch.server.settings") as mock_settings:
             mock_settings.vision_provider = "gemini"
             mock_settings.vision_model = "gemini-2.0-flash"
@@ -161,11 +220,21 @@ class TestResources:
             mock_settings.video_height = 720
             mock_settings.max_recording_duration = 30
 
-            result = get_config()
+            result = _render_config()
 
-            assert "gemini" in result
-            assert "1280x720" in result
-            assert "30" in result
+        assert "gemini" in result
+        assert "1280x720" in result
+        assert "30" in result
+
+    def test_get_config_returns_prerendered_text(self) -> None:
+        """Test get_config serves the text rendered at startup."""
+        mock_ctx = MagicMock()
+        mock_ctx.request_context.lifespan_context = AppContext(
+            browser=MagicMock(), vision=MagicMock(), config_text="AnimaWatch Configuration:"
+        )
+
+        with patch("animawatch.server.mcp.get_context", return_value=mock_ctx):
+            assert get_config() == "AnimaWatch Configuration:"
 
 
 class TestTools:
@@ -177,6 +246,7 @@ class TestTools:
         mock_browser = AsyncMock()
         mock_browser.record_interaction = AsyncMock(return_value=Path("/tmp/video.webm"))
         mock_browser.take_screenshot = AsyncMock(return_value=Path("/tmp/screenshot.png"))
+        mock_browser.take_screenshot_bytes = AsyncMock(return_value=b"\x89PNG")
 
         mock_vision = AsyncMock()
         mock_vision.analyze_video = AsyncMock(return_value="Video analysis result")
@@ -203,10 +273,7 @@ class TestTools:
         """Test watch tool records and analyzes video."""
         from animawatch.server import watch
 
-        with patch("animawatch.server.uuid.uuid4") as mock_uuid:
-            mock_uuid.return_value = MagicMock(hex="abc12345")
-            mock_uuid.return_value.__str__ = lambda self: "abc12345-6789-0123-4567-890123456789"
-
+        with patch("animawatch.server._next_id", return_value="abc12345"):
             result = await watch(
                 url="https://example.com",
                 ctx=mock_ctx,
@@ -215,17 +282,119 @@ class TestTools:
             # Verify the result contains expected structural elements
             assert result.startswith("## 🎬 Animation Analysis")
             assert "Analysis ID" in result
-            assert "abc12345" in result  # Check the mocked UUID is present
+            assert "abc12345" in result  # Check the mocked ID is present
             cast(AsyncMock, mock_app_context.browser.record_interaction).assert_called_once()
             cast(AsyncMock, mock_app_context.vision.analyze_video).assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_watch_without_context_raises(self) -> None:
-        """Test watch raises when context is None."""
+    async def test_watch_deletes_unsaved_video_in_background(
+        self, tmp_path: Path, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test an unsaved recording is removed after the tool returns."""
+        from animawatch.server import _background_tasks, watch
+
+        video = tmp_path / "video.webm"
+        video.write_bytes(b"webm")
+        mock_app_context.browser.record_interaction = AsyncMock(return_value=video)
+
+        await watch(url="https://example.com", save_recording=False, ctx=mock_ctx)
+        await asyncio.gather(*_background_tasks)
+
+        assert not video.exists()
+        assert mock_app_context.recordings == {}
+
+    @pytest.mark.asyncio
+    async def test_watch_reuses_recent_identical_analysis(
+        self, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test an identical watch call is served from the tool cache."""
         from animawatch.server import watch
 
-        with pytest.raises(RuntimeError, match="Context is required"):
-            await watch(url="https://example.com", ctx=None)
+        first = await watch(url="https://example.com", focus="modals", ctx=mock_ctx)
+        second = await watch(url="https://example.com", focus="modals", ctx=mock_ctx)
+
+        assert "Video analysis result" in first
+        assert "Video analysis result" in second
+        cast(AsyncMock, mock_app_context.browser.record_interaction).assert_awaited_once()
+        cast(AsyncMock, mock_app_context.vision.analyze_video).assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_watch_force_refresh_and_new_args_bypass_cache(
+        self, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test force_refresh or different arguments trigger a new recording."""
+        from animawatch.server import watch
+
+        await watch(url="https://example.com", ctx=mock_ctx)
+        await watch(url="https://example.com", force_refresh=True, ctx=mock_ctx)
+        await watch(url="https://example.com", focus="scroll", ctx=mock_ctx)
+
+        assert cast(AsyncMock, mock_app_context.vision.analyze_video).await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_watches_share_one_recording(
+        self, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test simultaneous identical watch calls coalesce into one run."""
+        from animawatch.server import watch
+
+        release = asyncio.Event()
+
+        async def slow_record(**_kwargs: object) -> Path:
+            await release.wait()
+            return Path("/tmp/video.webm")
+
+        mock_app_context.browser.record_interaction = AsyncMock(side_effect=slow_record)
+
+        calls = [
+            asyncio.create_task(watch(url="https://example.com", ctx=mock_ctx)) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert all("Video analysis result" in result for result in results)
+        cast(AsyncMock, mock_app_context.browser.record_interaction).assert_awaited_once()
+        assert mock_app_context.inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_coalesced_failure_is_logged_when_all_waiters_cancel(
+        self, mock_app_context: AppContext
+    ) -> None:
+        """Test a shared run's error is retrieved and logged after its waiters are gone."""
+        from animawatch.server import _coalesced
+
+        release = asyncio.Event()
+
+        async def failing_work() -> str:
+            await release.wait()
+            raise ConnectionError("down")
+
+        waiter = asyncio.create_task(_coalesced(mock_app_context, "key", failing_work))
+        await asyncio.sleep(0)
+        task = mock_app_context.inflight["key"]
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        with patch("animawatch.server.log_extra") as mock_log:
+            release.set()
+            with pytest.raises(ConnectionError):
+                await task
+            await asyncio.sleep(0)
+
+        mock_log.assert_called_once_with("Coalesced tool run failed", key="key", error="down")
+        assert mock_app_context.inflight == {}
+
+    def test_next_id_is_unique_and_fixed_width(self) -> None:
+        """Test result IDs are distinct 8-character hex strings."""
+        from animawatch.server import _next_id
+
+        first, second = _next_id(), _next_id()
+
+        assert first != second
+        assert len(first) == len(second) == 8
+        int(first, 16)
 
     @pytest.mark.asyncio
     async def test_watch_saves_recording_when_requested(
@@ -288,18 +457,219 @@ class TestTools:
         # Vision should NOT be called for record-only
         cast(AsyncMock, mock_app_context.vision.analyze_video).assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_screenshot_streams_analysis_of_in_memory_bytes(
+        self, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test screenshot streams the analysis of the capture bytes and returns them."""
+        from animawatch.server import screenshot
+
+        streamed_images: list[object] = []
+
+        async def stream(image: object, _prompt: str) -> AsyncIterator[str]:
+            streamed_images.append(image)
+            for chunk in ("Layout ", "looks good"):
+                yield chunk
+
+        mock_app_context.browser.take_screenshot_bytes = AsyncMock(return_value=b"\x89PNG fake")
+        mock_app_context.vision.analyze_image_streaming = stream
+        mock_ctx.report_progress = AsyncMock()
+
+        result = await screenshot(url="https://example.com", ctx=mock_ctx)
+
+        assert result.data == b"\x89PNG fake"
+        assert streamed_images == [b"\x89PNG fake"]
+        assert mock_ctx.report_progress.await_args_list[-1].kwargs == {"message": "looks good"}
+        assert "Layout looks good" in next(iter(mock_app_context.analyses.values()))
+        cast(AsyncMock, mock_app_context.browser.take_screenshot).assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_consensus_tool_formats_findings(
+        self, mock_ctx: MagicMock, mock_app_context: AppContext
+    ) -> None:
+        """Test the consensus tool renders each findings section."""
+        from animawatch.consensus import ConsensusResult
+        from animawatch.models import Finding, IssueCategory, Severity
+        from animawatch.server import analyze_with_consensus_tool
+
+        def finding(description: str, suggestion: str = "") -> Finding:
+            return Finding(
+                id=description,
+                category=IssueCategory.ANIMATION,
+                severity=Severity.MAJOR,
+                confidence=80,
+                description=description,
+                element="button",
+                suggestion=suggestion,
+            )
+
+        agreed = finding("Janky fade", "Use opacity")
+        consensus = ConsensusResult(
+            merged_findings=[agreed, finding("Gemini issue"), finding("Ollama issue")],
+            gemini_only=[finding("Gemini issue")],
+            ollama_only=[finding("Ollama issue")],
+            agreed_findings=[agreed],
+            gemini_result=None,
+            ollama_result=None,
+            consensus_score=50.0,
+        )
+
+        with patch(
+            "animawatch.consensus.analyze_with_consensus", AsyncMock(return_value=consensus)
+        ):
+            result = await analyze_with_consensus_tool(url="https://example.com", ctx=mock_ctx)
+
+        assert result == (
+            "## 🤝 Multi-Model Consensus Analysis\n\n"
+            "**URL**: https://example.com\n"
+            "**Consensus Score**: 50%\n\n"
+            "### ✅ Agreed Issues (High Confidence)\n\n"
+            "- **major** [animation]: Janky fade\n"
+            "  - 💡 Use opacity\n"
+            "\n### 🔵 Gemini-Only Findings\n\n"
+            "- **major**: Gemini issue\n"
+            "\n### 🟢 Ollama-Only Findings\n\n"
+            "- **major**: Ollama issue\n"
+        )
+        assert result in mock_app_context.analyses.values()
+
     @pytest.mark.asyncio
     async def test_check_accessibility_tool(
         self, mock_ctx: MagicMock, mock_app_context: AppContext
     ) -> None:
-        """Test check_accessibility tool."""
+        """Test check_accessibility collects the streamed analysis and caches it per URL."""
         from animawatch.server import check_accessibility
 
-        result = await check_accessibility(
-            url="https://example.com",
-            ctx=mock_ctx,
-        )
+        streamed_images: list[object] = []
+
+        async def stream(image: object, _prompt: str) -> AsyncIterator[str]:
+            streamed_images.append(image)
+            for chunk in ("Contrast ", "is low"):
+                yield chunk
+
+        mock_app_context.vision.analyze_image_streaming = stream
+        mock_ctx.report_progress = AsyncMock()
+
+        result = await check_accessibility(url="https://example.com", ctx=mock_ctx)
+        again = await check_accessibility(url="https://example.com", ctx=mock_ctx)
 
         assert "Accessibility Analysis" in result
-        cast(AsyncMock, mock_app_context.browser.take_screenshot).assert_called_once()
-        cast(AsyncMock, mock_app_context.vision.analyze_image).assert_called_once()
+        assert "Contrast is low" in again
+        assert streamed_images == [b"\x89PNG"]
+        mock_ctx.report_progress.assert_not_awaited()
+        cast(AsyncMock, mock_app_context.browser.take_screenshot_bytes).assert_called_once()
+        cast(AsyncMock, mock_app_context.browser.take_screenshot).assert_not_called()
+        mock_app_context.vision.analyze_image.assert_not_awaited()
+
+
+class TestListDevices:
+    """Tests for the list_devices tool."""
+
+    @pytest.mark.asyncio
+    async def test_filters_by_category(self) -> None:
+        """Test a category listing only includes devices from that category."""
+        from animawatch.server import list_devices
+
+        result = await list_devices("tablet")
+
+        assert "**Category**: tablet" in result
+        assert "ipad" in result.lower()
+        assert "iphone" not in result.lower()
+
+    @pytest.mark.asyncio
+    async def test_all_devices_by_default(self) -> None:
+        """Test omitting the category lists every device."""
+        from animawatch.devices import DEVICES
+        from animawatch.server import list_devices
+
+        result = await list_devices()
+
+        assert "**Category**" not in result
+        assert all(f"**{key}**" in result for key in DEVICES)
+
+    @pytest.mark.asyncio
+    async def test_invalid_category(self) -> None:
+        """Test an unknown category returns an error message."""
+        from animawatch.server import list_devices
+
+        result = await list_devices("watch")
+
+        assert "Invalid category" in result
+
+
+class TestMain:
+    """Tests for the server entry point."""
+
+    def test_defaults_to_stdio(self) -> None:
+        """Test the server runs over stdio without flags."""
+        from animawatch.server import main
+
+        with patch("animawatch.server.mcp.run") as mock_run:
+            main([])
+
+        mock_run.assert_called_once_with(transport="stdio")
+
+    def test_http_flag(self) -> None:
+        """Test --http selects the streamable-http transport."""
+        from animawatch.server import main
+
+        with patch("animawatch.server.mcp.run") as mock_run:
+            main(["--http"])
+
+        mock_run.assert_called_once_with(transport="streamable-http")
+
+    def test_uses_uvloop_when_installed(self) -> None:
+        """Test main installs the uvloop policy if the package is importable."""
+        from animawatch.server import main
+
+        fake_uvloop = MagicMock()
+        with (
+            patch.dict("sys.modules", {"uvloop": fake_uvloop}),
+            patch("animawatch.server.asyncio.set_event_loop_policy") as mock_set_policy,
+            patch("animawatch.server.mcp.run"),
+        ):
+            main([])
+
+        mock_set_policy.assert_called_once_with(fake_uvloop.EventLoopPolicy.return_value)
+
+
+class TestAppLifespan:
+    """Tests for server startup and shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_stops_browser_if_vision_setup_fails(self) -> None:
+        """Test the browser is closed when a later startup step raises."""
+        from animawatch.server import app_lifespan
+
+        browser = AsyncMock()
+        browser.__aenter__.return_value = browser
+        with (
+            patch("animawatch.browser.BrowserRecorder", return_value=browser),
+            patch("animawatch.vision.get_vision_provider", side_effect=ValueError("no key")),
+            pytest.raises(ValueError),
+        ):
+            async with app_lifespan(MagicMock()):
+                pass
+
+        browser.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_yields_context_and_closes_resources(self) -> None:
+        """Test startup builds the AppContext and shutdown closes both resources."""
+        from animawatch.server import app_lifespan
+
+        browser = AsyncMock()
+        browser.__aenter__.return_value = browser
+        vision = AsyncMock()
+        vision.__aenter__.return_value = vision
+        with (
+            patch("animawatch.browser.BrowserRecorder", return_value=browser),
+            patch("animawatch.vision.get_vision_provider", return_value=vision),
+        ):
+            async with app_lifespan(MagicMock()) as app_ctx:
+                assert app_ctx.browser is browser
+                assert app_ctx.vision is vision
+                assert app_ctx.config_text.startswith("AnimaWatch Configuration:")
+
+        browser.__aexit__.assert_awaited_once()
+        vision.__aexit__.assert_awaited_once()
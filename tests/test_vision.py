@@ -1,21 +1,38 @@
 """Tests for AnimaWatch vision AI providers."""
 
+import asyncio
+from collections.abc import AsyncIterator
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
+from google.genai import errors
 
 from animawatch.cache import AnalysisCache, analysis_cache
-from animawatch.retry import vision_circuit
-from animawatch.vision import GeminiProvider, OllamaProvider, get_vision_provider
+from animawatch.models import IssueCategory, Severity
+from animawatch.retry import CircuitOpenError, vision_circuit, vision_controller
+from animawatch.vision import (
+    GeminiProvider,
+    OllamaProvider,
+    VisionProvider,
+    _background_tasks,
+    _genai_client,
+    _ollama_client,
+    get_vision_provider,
+)
 
 
 @pytest.fixture(autouse=True)
 def reset_shared_state() -> None:
     """Reset circuit breaker and cache before each test to avoid state pollution."""
     vision_circuit.reset()
+    vision_controller.reset()
     # Clear the global cache to avoid test pollution
     analysis_cache._cache.clear()
+    _genai_client.cache_clear()
+    _ollama_client.cache_clear()
+    get_vision_provider.cache_clear()
 
 
 class TestGeminiProvider:
@@ -43,6 +60,19 @@ class TestGeminiProvider:
             # (avoid asserting internal implementation details)
             assert provider is not None
 
+    def test_providers_share_client_per_api_key(self) -> None:
+        """Test that providers built with the same key reuse one genai Client."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+
+            first, second = GeminiProvider(), GeminiProvider()
+
+            assert first.client is second.client
+            mock_genai.Client.assert_called_once_with(api_key="test-api-key")
+
     @pytest.mark.asyncio
     async def test_analyze_video_uploads_and_processes(self, tmp_path: Path) -> None:
         """Test that analyze_video uploads video and waits for processing."""
@@ -78,13 +108,68 @@ class TestGeminiProvider:
             result = await provider.analyze_video(video_path, "Analyze this")
 
             assert result == "Analysis result"
+            await asyncio.gather(*_background_tasks)
             mock_client.aio.files.upload.assert_called_once()
+            upload_kwargs = mock_client.aio.files.upload.call_args.kwargs
+            assert upload_kwargs["file"] == video_path
+            assert upload_kwargs["config"].mime_type == "video/webm"
             mock_client.aio.models.generate_content.assert_called_once()
             mock_client.aio.files.delete.assert_called_once_with(name="test-video")
 
+    @pytest.mark.asyncio
+    async def test_analyze_video_ignores_failed_cleanup(self, tmp_path: Path) -> None:
+        """Test that an API error deleting the upload doesn't discard the analysis."""
+        video_path = tmp_path / "test.webm"
+        video_path.write_bytes(b"fake video data")
+
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+
+            mock_video_file = MagicMock()
+            mock_video_file.state.name = "ACTIVE"
+            mock_video_file.name = "test-video"
+            mock_video_file.uri = "gs://test/video.webm"
+
+            mock_client = MagicMock()
+            mock_client.aio.files.upload = AsyncMock(return_value=mock_video_file)
+            mock_client.aio.files.delete = AsyncMock(side_effect=errors.APIError(404, {}))
+            mock_client.aio.models.generate_content = AsyncMock(
+                return_value=MagicMock(text="Analysis result")
+            )
+            mock_genai.Client.return_value = mock_client
+
+            result = await GeminiProvider().analyze_video(video_path, "Analyze this")
+            await asyncio.gather(*_background_tasks)
+
+        assert result == "Analysis result"
+        mock_client.aio.files.delete.assert_awaited_once_with(name="test-video")
+
+    @pytest.mark.asyncio
+    async def test_delete_upload_swallows_transport_errors(self) -> None:
+        """Test a network failure during background cleanup never escapes the task."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+            mock_client = MagicMock()
+            mock_client.aio.files.delete = AsyncMock(side_effect=httpx.ConnectError("refused"))
+            mock_genai.Client.return_value = mock_client
+
+            GeminiProvider()._delete_upload_later("test-video")
+            results = await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+        assert results == [None]
+        mock_client.aio.files.delete.assert_awaited_once_with(name="test-video")
+
     @pytest.mark.asyncio
     async def test_analyze_video_handles_processing_state(self, tmp_path: Path) -> None:
-        """Test that analyze_video waits while video is processing."""
+        """Test that analyze_video polls with backoff while video is processing."""
         # Create a real temp file for the cache to hash
         video_path = tmp_path / "test.webm"
         video_path.write_bytes(b"fake video data")
@@ -110,7 +195,7 @@ class TestGeminiProvider:
 
             mock_client = MagicMock()
             mock_client.aio.files.upload = AsyncMock(return_value=processing_file)
-            mock_client.aio.files.get = AsyncMock(return_value=active_file)
+            mock_client.aio.files.get = AsyncMock(side_effect=[processing_file, active_file])
             mock_client.aio.files.delete = AsyncMock()
 
             mock_response = MagicMock()
@@ -122,7 +207,9 @@ class TestGeminiProvider:
             provider = GeminiProvider()
             result = await provider.analyze_video(video_path, "Analyze")
 
-            mock_sleep.assert_called_once_with(1)
+            # Polling backs off exponentially from 100 ms
+            delays = [call.args[0] for call in mock_sleep.await_args_list]
+            assert delays == [pytest.approx(0.1), pytest.approx(0.17)]
             assert result == "Done"
 
     @pytest.mark.asyncio
@@ -179,6 +266,141 @@ class TestGeminiProvider:
             assert result == "Image analysis"
             mock_client.aio.models.generate_content.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_analyze_image_accepts_in_memory_bytes(self) -> None:
+        """Test that analyze_image sends raw PNG bytes without a file."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+            patch("animawatch.vision.types") as mock_types,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+
+            mock_response = MagicMock()
+            mock_response.text = "Image analysis"
+
+            mock_client = MagicMock()
+            mock_client.aio.models.generate_content = AsyncMock(return_value=mock_response)
+            mock_genai.Client.return_value = mock_client
+
+            provider = GeminiProvider()
+            result = await provider.analyze_image(b"png bytes", "Analyze image")
+
+            assert result == "Image analysis"
+            mock_types.Part.from_bytes.assert_called_once_with(
+                data=b"png bytes", mime_type="image/png"
+            )
+
+    @pytest.mark.asyncio
+    async def test_streaming_populates_and_reuses_cache(self) -> None:
+        """Test a finished stream is cached and replayed as one chunk next time."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+
+            async def chunks() -> AsyncIterator[MagicMock]:
+                for text in ("Looks ", "fine"):
+                    yield MagicMock(text=text)
+
+            mock_client = MagicMock()
+            mock_client.aio.models.generate_content_stream = AsyncMock(return_value=chunks())
+            mock_genai.Client.return_value = mock_client
+
+            provider = GeminiProvider()
+            first = [c async for c in provider.analyze_image_streaming(b"png", "Analyze")]
+            second = [c async for c in provider.analyze_image_streaming(b"png", "Analyze")]
+
+            assert first == ["Looks ", "fine"]
+            assert second == ["Looks fine"]
+            mock_client.aio.models.generate_content_stream.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_streaming_retries_opening_the_stream(self) -> None:
+        """Test a transient failure to open the stream is retried."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+            patch("animawatch.retry.asyncio.sleep", new_callable=AsyncMock),
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+
+            async def chunks() -> AsyncIterator[MagicMock]:
+                yield MagicMock(text="ok")
+
+            mock_client = MagicMock()
+            mock_client.aio.models.generate_content_stream = AsyncMock(
+                side_effect=[ConnectionError("reset"), chunks()]
+            )
+            mock_genai.Client.return_value = mock_client
+
+            provider = GeminiProvider()
+            result = [c async for c in provider.analyze_image_streaming(b"png", "Analyze")]
+
+            assert result == ["ok"]
+            assert mock_client.aio.models.generate_content_stream.await_count == 2
+            assert vision_circuit.state == "CLOSED"
+
+    @pytest.mark.asyncio
+    async def test_streaming_respects_open_circuit(self) -> None:
+        """Test streaming is refused before any chunk while the circuit is open."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+            mock_client = MagicMock()
+            mock_client.aio.models.generate_content_stream = AsyncMock()
+            mock_genai.Client.return_value = mock_client
+            for _ in range(vision_circuit.failure_threshold):
+                vision_circuit.record_failure()
+
+            provider = GeminiProvider()
+            with pytest.raises(CircuitOpenError):
+                async for _ in provider.analyze_image_streaming(b"png", "Analyze"):
+                    pass
+
+            mock_client.aio.models.generate_content_stream.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_streaming_failure_trips_circuit(self) -> None:
+        """Test a stream that breaks mid-way is recorded as a circuit failure."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai") as mock_genai,
+        ):
+            mock_settings.gemini_api_key = "test-api-key"
+            mock_settings.vision_model = "gemini-2.0-flash"
+
+            async def broken() -> AsyncIterator[MagicMock]:
+                yield MagicMock(text="partial")
+                raise ConnectionError("dropped")
+
+            mock_client = MagicMock()
+            mock_client.aio.models.generate_content_stream = AsyncMock(
+                side_effect=lambda **_: broken()
+            )
+            mock_genai.Client.return_value = mock_client
+
+            provider = GeminiProvider()
+            for _ in range(vision_circuit.failure_threshold):
+                with pytest.raises(ConnectionError):
+                    async for _ in provider.analyze_image_streaming(b"png", "Analyze"):
+                        pass
+
+            assert vision_circuit.state == "OPEN"
+            assert (
+                await provider._cache.get(
+                    provider._cache.hash_bytes(b"png", "Analyze", model="gemini-2.0-flash")
+                )
+                is None
+            )
+
     @pytest.mark.asyncio
     async def test_analyze_image_returns_empty_on_blank_response(self, tmp_path: Path) -> None:
         """Test that analyze_image returns empty string when response has no text."""
@@ -273,6 +495,27 @@ class TestOllamaProvider:
         assert call_args.kwargs["model"] == "qwen2.5-vl:7b"
         assert "images" in call_args.kwargs["messages"][0]
 
+    @pytest.mark.asyncio
+    async def test_structured_cache_hit_skips_parsing(self) -> None:
+        """Test a structured cache hit returns the stored model without re-parsing."""
+        mock_client = AsyncMock()
+        mock_client.chat.return_value = {
+            "message": {"content": '{"findings": [], "summary": "Clean", "overall_score": 95}'}
+        }
+
+        provider = OllamaProvider.__new__(OllamaProvider)
+        provider.client = mock_client
+        provider.model = "qwen2.5-vl:7b"
+        provider._cache = AnalysisCache()
+
+        first = await provider.analyze_image(b"image", "Analyze", structured=True)
+        with patch.object(provider, "_parse_structured_response") as mock_parse:
+            second = await provider.analyze_image(b"image", "Analyze", structured=True)
+
+        mock_parse.assert_not_called()
+        mock_client.chat.assert_called_once()
+        assert second == first
+
 
 class TestGetVisionProvider:
     """Tests for get_vision_provider factory function."""
@@ -308,3 +551,205 @@ class TestGetVisionProvider:
 
             # Check class name due to module reloading during mocking
             assert type(provider).__name__ == "OllamaProvider"
+
+    def test_returns_same_instance_on_repeat_calls(self) -> None:
+        """Test that the provider is built once and then reused."""
+        with (
+            patch("animawatch.vision.settings") as mock_settings,
+            patch("animawatch.vision.genai"),
+        ):
+            mock_settings.vision_provider = "gemini"
+            mock_settings.gemini_api_key = "test-key"
+
+            assert get_vision_provider() is get_vision_provider()
+
+
+class TestAnalyzeImagesParallel:
+    """Tests for bounded concurrent image analysis."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_and_bounds_concurrency(self) -> None:
+        """Test results keep input order and no more than max_concurrent run at once."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        VisionProvider.__init__(provider)
+        running = 0
+        peak = 0
+
+        async def fake_analyze(path: Path, prompt: str, structured: bool) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001 * (5 - int(path.stem)))
+            running -= 1
+            return f"{path.stem}:{prompt}"
+
+        paths = [Path(f"{i}.png") for i in range(5)]
+        with patch.object(provider, "analyze_image", side_effect=fake_analyze):
+            results = await provider.analyze_images_parallel(paths, "p", max_concurrent=2)
+
+        assert results == [f"{i}:p" for i in range(5)]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_overlapping_batches_share_the_limit(self) -> None:
+        """Test concurrent calls on one provider stay within max_concurrent together."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        VisionProvider.__init__(provider)
+        running = 0
+        peak = 0
+
+        async def fake_analyze(path: Path, prompt: str, structured: bool) -> str:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+            return prompt
+
+        paths = [Path(f"{i}.png") for i in range(4)]
+        with patch.object(provider, "analyze_image", side_effect=fake_analyze):
+            await asyncio.gather(
+                provider.analyze_images_parallel(paths, "a", max_concurrent=2),
+                provider.analyze_images_parallel(paths, "b", max_concurrent=2),
+            )
+
+        assert peak == 2
+
+    def test_limits_work_across_event_loops(self) -> None:
+        """Test one provider can run batches under separate asyncio.run calls."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        VisionProvider.__init__(provider)
+
+        async def fake_analyze(path: Path, prompt: str, structured: bool) -> str:
+            await asyncio.sleep(0)
+            return prompt
+
+        async def contended_batches() -> None:
+            # Overlapping batches make the shared semaphore wait, binding it to the loop
+            paths = [Path(f"{i}.png") for i in range(2)]
+            await asyncio.gather(
+                provider.analyze_images_parallel(paths, "a", max_concurrent=1),
+                provider.analyze_images_parallel(paths, "b", max_concurrent=1),
+            )
+
+        with patch.object(provider, "analyze_image", side_effect=fake_analyze):
+            asyncio.run(contended_batches())
+            asyncio.run(contended_batches())
+
+    @pytest.mark.asyncio
+    async def test_raises_first_failure(self) -> None:
+        """Test a failing analysis propagates as its own exception type."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        VisionProvider.__init__(provider)
+        failing = AsyncMock(side_effect=ConnectionError("down"))
+
+        with (
+            patch.object(provider, "analyze_image", failing),
+            pytest.raises(ConnectionError, match="down"),
+        ):
+            await provider.analyze_images_parallel([Path("a.png"), Path("b.png")], "p")
+
+
+class TestFileCacheKey:
+    """Tests for memoized file cache keys."""
+
+    @pytest.mark.asyncio
+    async def test_rehashes_only_when_file_changes(self, tmp_path: Path) -> None:
+        """Test an unchanged file reuses its key and a rewritten one is re-hashed."""
+        video_path = tmp_path / "clip.webm"
+        video_path.write_bytes(b"first")
+        provider = OllamaProvider.__new__(OllamaProvider)
+        VisionProvider.__init__(provider)
+
+        with patch.object(provider._cache, "hash_file", wraps=provider._cache.hash_file) as spy:
+            first = await provider._file_cache_key(video_path, "p", False, "m")
+            assert await provider._file_cache_key(video_path, "p", False, "m") == first
+            assert spy.call_count == 1
+
+            video_path.write_bytes(b"second!")
+            assert await provider._file_cache_key(video_path, "p", False, "m") != first
+            assert spy.call_count == 2
+
+
+class TestLoadImage:
+    """Tests for reading image inputs."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("name", "mime_type"),
+        [
+            ("shot.png", "image/png"),
+            ("shot.JPG", "image/jpeg"),
+            ("shot.webp", "image/webp"),
+            ("shot", "image/png"),
+        ],
+    )
+    async def test_mime_type_from_suffix(self, tmp_path: Path, name: str, mime_type: str) -> None:
+        """Test MIME types come from the file suffix, defaulting to PNG."""
+        image_path = tmp_path / name
+        image_path.write_bytes(b"data")
+
+        data, detected = await OllamaProvider._load_image(image_path)
+
+        assert data == b"data"
+        assert detected == mime_type
+
+
+class TestParseStructuredResponse:
+    """Tests for parsing structured JSON responses."""
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            '{"findings": [], "summary": "Looks good"}',
+            '```json\n{"findings": [], "summary": "Looks good"}\n```',
+            '  ```\n{"findings": [], "summary": "Looks good"}```\n',
+            '{"findings": null, "summary": "Looks good"}',
+        ],
+    )
+    def test_strips_optional_code_fence(self, response: str) -> None:
+        """Test bare, fenced and null-findings JSON parse to the same result."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+
+        result = provider._parse_structured_response(response, "ollama", "test-model", 0)
+
+        assert result.success is True
+        assert result.summary == "Looks good"
+
+    def test_builds_findings_with_enum_members(self) -> None:
+        """Test findings map category and severity strings onto enum members."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        response = (
+            '{"findings": [{"id": "f1", "category": "layout", "severity": "major"},'
+            ' {"description": "no id"}], "summary": "Two issues"}'
+        )
+
+        result = provider._parse_structured_response(response, "ollama", "test-model", 0)
+
+        first, second = result.findings
+        assert (first.id, first.category, first.severity) == (
+            "f1",
+            IssueCategory.LAYOUT,
+            Severity.MAJOR,
+        )
+        assert second.category is IssueCategory.VISUAL_ARTIFACT
+        assert len(second.id) == 8
+
+    def test_unknown_category_falls_back_to_raw_summary(self) -> None:
+        """Test an unrecognized category fails parsing like any other bad value."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+        response = '{"findings": [{"category": "sparkles"}], "summary": "x"}'
+
+        result = provider._parse_structured_response(response, "ollama", "test-model", 0)
+
+        assert result.findings == []
+        assert result.summary == response
+
+    def test_non_object_json_falls_back_to_raw_summary(self) -> None:
+        """Test a JSON reply that is not an object is kept as the summary."""
+        provider = OllamaProvider.__new__(OllamaProvider)
+
+        result = provider._parse_structured_response("[1, 2]", "ollama", "test-model", 0)
+
+        assert result.findings == []
+        assert result.summary == "[1, 2]"